@@ -1,15 +1,61 @@
-import os
-from factcheckexplorer.factcheckexplorer import FactCheckLib
-from dash import Dash, dcc, html, Input, Output, callback, State, dash_table
+from dash import Dash, dcc, html, Input, Output, callback, State, ctx, dash_table, no_update
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import pandas as pd
-import ast
+import base64
+import os
 import time
+import uuid
+from contextlib import nullcontext
+from urllib.parse import urlencode
 import dash_cytoscape as cyto
 
-app = Dash(__name__, external_stylesheets=[dbc.themes.SANDSTONE])
+from feat.batch import evict_batches, parse_queries, register_batch_routes, run_batch
+from feat.cache import ResultCache
+from feat.compare import AggregateStore, ComparisonMemo, comparison_network
+from feat.corpus import Corpus
+from feat.export import register_export_routes
+from feat.figures import (FigureMemo, compare_sources_figure, compare_timeline_figure, compare_verdicts_figure,
+                          placeholder_figure, sources_figure, tags_figure, timeline_figure, verdict_figure)
+from feat.jobs import background_manager, fetch_slot
+from feat.lazy import lazy_import, start_warm_up
+from feat.metrics import register_metrics_routes, stage, traced
+from feat.network import build_network
+from feat.pipeline import search_results
+from feat.store import ResultStore, result_digest
+from feat.table import table_page
+
+pd = lazy_import('pandas')
+
+app = Dash(__name__, external_stylesheets=[dbc.themes.SANDSTONE], background_callback_manager=background_manager())
 server = app.server
+result_cache = ResultCache()
+corpus = Corpus()
+result_store = ResultStore()
+figure_memo = FigureMemo()
+aggregate_store = AggregateStore()
+comparison_memo = ComparisonMemo(aggregate_store)
+register_export_routes(server, result_store, result_digest)
+BATCH_DIR = os.environ.get('FEAT_BATCH_DIR', os.path.join('.feat_cache', 'batches'))
+BATCH_TTL = int(os.environ.get('FEAT_BATCH_TTL', 24 * 3600))
+register_batch_routes(server, BATCH_DIR)
+
+
+def metrics_gauges():
+    cache_stats = result_cache.stats()
+    store_stats = result_store.stats()
+    return [
+        ('feat_result_cache_hits', "Result cache hits.", cache_stats['hits']),
+        ('feat_result_cache_misses', "Result cache misses.", cache_stats['misses']),
+        ('feat_result_cache_evictions', "Result cache evictions.", cache_stats['evictions']),
+        ('feat_result_cache_bytes', "Bytes held by the result cache.", cache_stats['bytes']),
+        ('feat_result_store_memory_bytes', "Result frames held in this worker's memory.", store_stats['memory_bytes']),
+        ('feat_corpus_claims', "Claims in the local corpus.", corpus.stats()['claims']),
+        ('feat_compare_aggregates_bytes', "Bytes held by the per-query comparison aggregates.",
+         aggregate_store.stats()['bytes']),
+    ]
+
+
+register_metrics_routes(server, gauges=metrics_gauges)
+start_warm_up()
 
 layout = {
     'name': 'cose',
@@ -36,13 +82,11 @@ stylesheet = [
      'style': {'background-color': '#ef553b', 'color': '#000000', 'width': '40px', 'height': '40px',
                'border-color': '#bc422e', 'border-width': 2, 'shape': 'ellipse'}},
     {'selector': 'edge',
-     'style': {'curve-style': 'bezier', 'width': 2, 'line-color': '#ABB2B9', 'target-arrow-color': '#ABB2B9',
-               'target-arrow-shape': 'triangle'}},
+     'style': {'curve-style': 'bezier', 'width': 'mapData(weight, 1, 20, 2, 10)', 'line-color': '#ABB2B9',
+               'target-arrow-color': '#ABB2B9', 'target-arrow-shape': 'triangle'}},
     {'selector': 'core', 'style': {'background-color': '#F8F9F9', 'font-family': 'Helvetica'}}
 ]
 
-global df, csv_filename
-
 def create_info_card(title, icon_class, body_id):
     return dbc.Card(
         [
@@ -60,208 +104,267 @@ def create_info_card(title, icon_class, body_id):
 def toggle_collapse(*values):
     return [1 in value for value in values]
 
-@app.callback(Output("download-csv", "data"), Input("btn-download-csv", "n_clicks"), prevent_initial_call=True)
-def generate_csv(n_clicks):
-    if n_clicks and 'df' in globals() and not df.empty:
-        return dcc.send_data_frame(df.to_csv, filename=csv_filename)
+def stored_results(handle):
+    if not handle or handle.get('error'):
+        return None
+    return result_store.get(handle.get('key'))
+
+
+@app.callback(Output("btn-download-results", "href"), Input("result-store", "data"), Input("export-format", "value"))
+def update_export_link(handle, export_format):
+    if not handle or not handle.get('key'):
+        return None
+    # Relative to the app's path prefix, so downloads also work when FEAT is hosted below the site root.
+    path = app.get_relative_path(f"/export/{handle['key']}.{export_format}")
+    return f"{path}?{urlencode({'filename': handle['filename']})}"
+
+
+@app.callback(
+    Output("factcheck-table", "data"),
+    Output("factcheck-table", "page_count"),
+    Output("table-filter-message", "children"),
+    Input("result-store", "data"),
+    Input("factcheck-table", "page_current"),
+    Input("factcheck-table", "page_size"),
+    Input("factcheck-table", "sort_by"),
+    Input("factcheck-table", "filter_query"),
+    prevent_initial_call=True
+)
+def update_table(handle, page_current, page_size, sort_by, filter_query):
+    results = stored_results(handle)
+    if results is None:
+        return [], 1, None
+    try:
+        return *table_page(results, page_current, page_size, sort_by, filter_query), None
+    except ValueError as e:
+        print(f"Error filtering table: {e}")
+        return *table_page(results, page_current, page_size, sort_by), f"{e}. Showing all results."
 
 
 @app.callback(
     [
-        Output("verdict-pie-chart", "figure"),
-        Output("tags-bar-chart", "figure"),
-        Output("claims-timeline", "figure"),
-        Output("sources-bar-chart", "figure"),
         Output("panel-search-query", "children"),
         Output("panel-num-results", "children"),
         Output("panel-unique-sources", "children"),
         Output("panel-unique-tags", "children"),
         Output("factcheck-table", "columns"),
-        Output("factcheck-table", "data"),
-        Output("network-graph", "elements")
+        Output("factcheck-table", "page_current"),
+        Output("result-store", "data")
     ],
     [
         Input("search-button", "n_clicks"),
         State("query-input", "value"),
         State("language-input", "value"),
         State("num-results-input", "value"),
-        State("graph-checkbox", "value")
+        State("search-mode", "value"),
+        State("date-range", "start_date"),
+        State("date-range", "end_date"),
+        State("result-store", "data")
     ],
+    background=True,
+    running=[
+        (Output("search-button", "disabled"), True, False),
+        (Output("btn-cancel-search", "disabled"), False, True),
+    ],
+    cancel=[Input("btn-cancel-search", "n_clicks")],
+    progress=[Output("search-progress", "value"), Output("search-progress", "label")],
+    progress_default=[0, ""],
     prevent_initial_call=True
 )
-def update_charts(n_clicks, query, language, num_results, graph_checkbox):
-    global df, csv_filename
+def run_search(set_progress, n_clicks, query, language, num_results, search_mode, start_date, end_date,
+               previous_handle):
     if n_clicks < 1 or not query:
-        empty_fig = px.scatter(title="Waiting for data...")
-        # Return empty_fig for each graph and suitable placeholders for text outputs
-        return empty_fig, empty_fig, empty_fig, empty_fig, "N/A", "0 Results", "0 Unique Sources", "0 Unique Tags"
+        return "N/A", "0 Results", "0 Unique Sources", "0 Unique Tags", no_update, no_update, None
+
+    with traced('search_job', query=query, language=language or 'all', mode=search_mode or 'remote'):
+        previous_key = (previous_handle or {}).get('key')
+        try:
+            csv_filename = f"{query.replace(' ', '_').lower() + '_' + str(time.time()).replace('.', '')}.csv"
+            set_progress((10, "Fetching..."))
+            with (fetch_slot(on_wait=lambda: set_progress((5, "Queued...")))
+                  if search_mode != 'local' else nullcontext()):
+                results = search_results(query, language, num_results, cache=result_cache, corpus=corpus,
+                                         mode=search_mode or 'remote', since=start_date, until=end_date,
+                                         progress=lambda done, total: set_progress(
+                                             (10 + 60 * done // total, f"Fetching page {done}/{total}...")))
+        except Exception as e:
+            print(f"Error processing FactCheckLib: {e}")
+            if previous_key:
+                result_store.discard(previous_key)
+            return query, "Error", "Error", "Error", no_update, no_update, {'error': True}
+
+        set_progress((90, "Storing..."))
+        search_query_display = query if query else "Not specified"
+        num_results_display = f"{len(results)} Results"
+        unique_sources_display = f"{results.frame['Source Name'].nunique()} Unique Sources"
+        unique_tags_display = f"{len(results.tags.categories)} Unique Tags"
+
+        with stage('store', rows=len(results)):
+            handle = {'key': result_store.put(results, previous=previous_key), 'digest': result_digest(results),
+                      'filename': csv_filename, 'query': query}
+
+        columns = [{"name": col, "id": col, "type": "datetime"}
+                   if col in results.frame and pd.api.types.is_datetime64_any_dtype(results.frame[col])
+                   else {"name": col, "id": col} for col in results.columns]
+
+        return (search_query_display, num_results_display, unique_sources_display, unique_tags_display, columns, 0,
+                handle)
+
+
+@app.callback(Output("batch-upload-label", "children"), Input("batch-upload", "filename"), prevent_initial_call=True)
+def show_batch_filename(filename):
+    return f"Selected: {filename}"
 
-    df = pd.DataFrame()
 
-    try:
-        csv_filename = f"{query.replace(' ', '_').lower() + '_' + str(time.time()).replace('.', '')}.csv"
-        fact_check_lib = FactCheckLib(query=query, language=language or 'all', num_results=num_results or 100,
-                                      csv_filename=csv_filename)
-        fact_check_lib.process()
-        df = pd.read_csv(csv_filename, encoding='utf-8')
-    except Exception as e:
-        print(f"Error processing FactCheckLib: {e}")
-        error_fig = px.scatter(title="Error fetching data")
-        return error_fig, error_fig, error_fig, error_fig, query, "Error", "Error", "Error"
-
-    df['Tags'] = df['Tags'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-    tags_df = df.explode('Tags')
-
-    def normalize_text(text):
-        text = text.rstrip('.')
-        text = text.lower()
-        return text
-
-    df['Verdict'] = df['Verdict'].apply(normalize_text) \
-        .str.replace(r"falso", r"false", regex=False) \
-        .str.replace(r"fake", r"false", regex=False) \
-        .str.replace(r"falsa", r"false", regex=False) \
-        .str.replace(r"verdadero", r"true", regex=False) \
-        .str.replace(r"c'est faux", r"false", regex=False) \
-        .str.replace(r"doğru", r"true", regex=False) \
-        .str.replace(r"dogru", r"true", regex=False) \
-        .str.replace(r"doğruluk payı vardır", r"half true", regex=False) \
-        .str.replace(r"errado", r"false", regex=False) \
-        .str.replace(r"মিথ্যা", r"false", regex=False) \
-        .str.replace(r"অসত্য", r"false", regex=False) \
-        .str.replace(r"fals", r"false", regex=False) \
-        .str.replace(r"falsch", r"false", regex=False) \
-        .str.replace(r"false content/false", r"false", regex=False) \
-        .str.replace(r"false context/false", r"false", regex=False) \
-        .str.replace(r"falso!", r"false", regex=False) \
-        .str.replace(r"faux", r"false", regex=False) \
-        .str.replace(r"mostly true", r"half true", regex=False) \
-        .str.replace(r"partialmente falso", r"mostly false", regex=False) \
-        .str.replace(r"misleading/partly false", r"mostly false", regex=False) \
-        .str.replace(r"Çok YanlÄ±ÅŞ", r"false", regex=False) \
-        .str.replace(r"incorrect", r"false", regex=False) \
-        .str.replace(r"مضلل", r"false", regex=False) \
-        .str.replace(r"نادرست", r"false", regex=False) \
-        .str.replace(r"زائف", r"false", regex=False) \
-        .str.replace(r"錯誤", r"false", regex=False) \
-        .str.replace(r"部分錯誤", r"false", regex=False) \
-        .str.replace(r"pants on fire", r"false", regex=False) \
-        .str.replace(r"four pinocchios", r"false", regex=False) \
-        .str.replace(r"three pinocchios", r"mostly false", regex=False) \
-        .str.replace(r"falsee", r"false", regex=False) \
-        .str.replace(r"неверно", r"false", regex=False) \
-        .str.replace(r"правильно", r"true", regex=False) \
-        .str.replace(r"помилковий", r"false", regex=False) \
-        .str.replace(r"вірно", r"true", regex=False) \
-        .str.replace(r"錯誤的", r"false", regex=False) \
-        .str.replace(r"正確的", r"true", regex=False) \
-        .str.replace(r"錯誤な", r"false", regex=False) \
-        .str.replace(r"正しい", r"true", regex=False) \
-        .str.replace(r"incorrecto", r"false", regex=False) \
-        .str.replace(r"notizia false", r"false", regex=False) \
-        .str.replace(r"c'eri quasi", r"half true", regex=False) \
-        .str.replace(r"pinocchio andante", r"false", regex=False) \
-        .str.replace(r"notizia vera", r"true", regex=False) \
-        .str.replace(r"vera", r"true", regex=False) \
-        .str.replace(r"vero", r"true", regex=False) \
-        .str.replace(r"cierto", r"true", regex=False) \
-        .str.replace(r"engañoso", r"mostly false", regex=False) \
-        .str.replace(r"es falso", r"false", regex=False) \
-        .str.replace(r"scam", r"false", regex=False) \
-        .str.replace(r"enganoso", r"false", regex=False) \
-        .str.replace(r"falsz", r"false", regex=False) \
-        .str.replace(r"falsekt", r"false", regex=False) \
-        .str.replace(r"falsekt", r"false", regex=False) \
-        .str.replace(r"misleidend", r"misleading", regex=False) \
-        .str.replace(r"trompeur", r"false", regex=False) \
-        .str.replace(r"yanlış", r"false", regex=False) \
-        .str.replace(r"es false", r"false", regex=False) \
-        .str.replace(r"correct attribution", r"true", regex=False) \
-        .str.replace(r"correct", r"true", regex=False) \
-        .str.replace(r"delimično netačno", r"mostly false", regex=False) \
-        .str.replace(r"enganador", r"mostly false", regex=False) \
-        .str.replace(r"epätosi", r"false", regex=False) \
-        .str.replace(r"fałsz", r"false", regex=False) \
-
-    verdict_counts = df['Verdict'].value_counts(normalize=True) * 100
-    small_verdicts = verdict_counts[verdict_counts < 2].index
-    df['Verdict Grouped'] = df['Verdict'].apply(lambda x: 'other' if x in small_verdicts else x)
-
-    verdict_fig = px.pie(df, names='Verdict Grouped', title='Verdict Distribution')
-    verdict_fig.update_traces(textinfo='percent+label')
-
-    tags_fig = px.bar(tags_df['Tags'].value_counts().reset_index(), x='index', y='Tags',
-                      title='Tags Volume', labels={'index': 'Tag', 'Tags': 'Count'})
-    tags_fig.update_layout(xaxis_title="Tag", yaxis_title="Count")
-
-    df['Review Publication Date'] = pd.to_datetime(df['Review Publication Date'])
-    timeline_fig = px.scatter(df, x='Review Publication Date', y='Verdict Grouped', color='Verdict Grouped',
-                              title='Timeline of Claims', labels={'Review Publication Date': 'Date'})
-    timeline_fig.update_layout(xaxis_title="Date", yaxis_title="Verdict")
-
-    sources_counts = df['Source Name'].value_counts().reset_index()
-    sources_fig = px.bar(sources_counts, x='Source Name', y='index', orientation='h',
-                         labels={'index': 'Source', 'Source Name': 'Number of Checks'},
-                         title='Source Volume', text_auto='.2s')
-    sources_fig.update_layout(xaxis_title="Number of Checks", yaxis_title="Source",
-                              font=dict(family="Roboto, sans-serif", size=12, color="#333"))
-
-    search_query_display = query if query else "Not specified"
-    num_results_display = f"{len(df)} Results"
-    unique_sources_display = f"{df['Source Name'].nunique()} Unique Sources"
-
-    df['Tags'] = df['Tags'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) and x.startswith('[') else x)
-    unique_tags_display = f"{df.explode('Tags')['Tags'].nunique()} Unique Tags"
-
-    if 'Tags' in df.columns:
-        df['Tags'] = df['Tags'].apply(
-            lambda tags_list: ', '.join(tags_list) if isinstance(tags_list, list) else tags_list)
-
-    columns = [{"name": col, "id": col} for col in df.columns]
-
-    data = df.to_dict('records')
-
-    if 'ON' in graph_checkbox:
-        def process_tags(tags):
-            if isinstance(tags, str):
-                return [tag.strip() for tag in tags.split(',')]
-            elif isinstance(tags, list):
-                return tags
-            return []
-
-        df['Tags'] = df['Tags'].apply(process_tags)
-
-        nodes = [{'data': {'id': src, 'label': src}, 'classes': 'source'} for src in df['Source Name'].unique()]
-        nodes += [{'data': {'id': tag, 'label': tag}, 'classes': 'tag'} for tag in
-                  set().union(*(df['Tags'].dropna()))]  # Assumes 'Tags' are lists
-
-        added_edges = set()
-
-        edges = []
-        for _, row in df.iterrows():
-            src = row['Source Name']
-            tags = row['Tags'] if isinstance(row['Tags'], list) else []
-            for tag in tags:
-                # Create a unique identifier for each potential edge
-                edge_identifier = (src, tag)
-                # Check if this edge has already been added
-                if edge_identifier not in added_edges:
-                    edges.append({
-                        'data': {'source': src, 'target': tag}
-                    })
-                    # Mark this edge as added
-                    added_edges.add(edge_identifier)
-
-        network_elements = nodes + edges
-    else:
-        network_elements = []
+@app.callback(
+    Output("batch-summary", "children"),
+    Output("btn-download-batch", "href"),
+    Input("btn-run-batch", "n_clicks"),
+    State("batch-upload", "contents"),
+    State("language-input", "value"),
+    State("num-results-input", "value"),
+    background=True,
+    running=[
+        (Output("btn-run-batch", "disabled"), True, False),
+    ],
+    progress=[Output("batch-progress", "value"), Output("batch-progress", "label")],
+    progress_default=[0, ""],
+    prevent_initial_call=True
+)
+def run_batch_upload(set_progress, n_clicks, contents, language, num_results):
+    if not n_clicks or not contents:
+        return "Upload a query list first.", None
+    text = base64.b64decode(contents.split(',', 1)[1]).decode('utf-8', errors='replace')
+    queries = parse_queries(text, language, num_results or 100)
+    if not queries:
+        return "No queries found in the uploaded file.", None
+
+    evict_batches(BATCH_DIR, BATCH_TTL)
+    batch_id = uuid.uuid4().hex
+    set_progress((0, f"0/{len(queries)} queries"))
+    with traced('batch_job', queries=len(queries)):
+        summaries = run_batch(queries, os.path.join(BATCH_DIR, batch_id), cache=result_cache, corpus=corpus,
+                              fetch_guard=fetch_slot,
+                              progress=lambda done, total: set_progress((100 * done // total,
+                                                                         f"{done}/{total} queries")))
+    summary = dash_table.DataTable(
+        columns=[{"name": col, "id": col} for col in ["query", "language", "num_results", "results", "error"]],
+        data=[dict(s, language=s['language'] or 'all') for s in summaries],
+        page_size=10,
+        style_cell={'textAlign': 'left'},
+    )
+    return summary, app.get_relative_path(f"/batch/{batch_id}.zip")
+
+
+def register_figure_callback(graph_id, collapse_id, builder, params=None):
+    """``params`` maps extra builder keyword arguments to the ``Input`` that provides them."""
+    params = params or {}
+
+    @app.callback(
+        Output(graph_id, "figure"),
+        Input("result-store", "data"),
+        Input(f"collapse-{collapse_id}", "is_open"),
+        *params.values(),
+        prevent_initial_call=True
+    )
+    def update_figure(handle, is_open, *values):
+        # Collapsed charts are left alone; expanding one later triggers this callback again.
+        if not is_open:
+            return no_update
+        if handle is None:
+            return placeholder_figure("Waiting for data...")
+        results = stored_results(handle)
+        if results is None:
+            return placeholder_figure("Error fetching data")
+        return figure_memo.get_or_build(handle['digest'], builder, results, **dict(zip(params, values)))
+
+    return update_figure
 
-    try:
-        os.remove(csv_filename)
-    except Exception as e:
-        print(f"Could not remove CSV file: {e}")
 
-    return verdict_fig, tags_fig, timeline_fig, sources_fig, search_query_display, num_results_display, unique_sources_display, unique_tags_display, columns, data, network_elements,
+update_verdict_chart = register_figure_callback("verdict-pie-chart", "verdict-chart", verdict_figure)
+update_tags_chart = register_figure_callback("tags-bar-chart", "tags-chart", tags_figure)
+update_claims_timeline = register_figure_callback("claims-timeline", "claims-timeline", timeline_figure,
+                                                  params={'mode': Input("timeline-mode", "value")})
+update_sources_chart = register_figure_callback("sources-bar-chart", "sources-bar-chart", sources_figure)
+
+
+@app.callback(
+    Output("network-graph", "elements"),
+    Input("result-store", "data"),
+    Input("collapse-network-graph", "is_open"),
+    Input("graph-checkbox", "value"),
+    Input("network-top-k-input", "value"),
+    Input("network-min-weight-input", "value"),
+    prevent_initial_call=True
+)
+def update_network(handle, is_open, graph_checkbox, network_top_k, network_min_weight):
+    if not is_open:
+        return no_update
+    results = stored_results(handle)
+    if results is None or 'ON' not in graph_checkbox:
+        return []
+    return figure_memo.get_or_build(handle['digest'], build_network, results, top_k=network_top_k,
+                                    min_weight=network_min_weight)
+
+
+@app.callback(
+    Output("compare-store", "data"),
+    Output("compare-queries", "options"),
+    Output("compare-queries", "value"),
+    Input("btn-add-compare", "n_clicks"),
+    Input("btn-clear-compare", "n_clicks"),
+    State("result-store", "data"),
+    State("compare-store", "data"),
+    State("compare-queries", "value"),
+    prevent_initial_call=True
+)
+def update_comparison(add_clicks, clear_clicks, handle, compared, selected):
+    if ctx.triggered_id == "btn-clear-compare":
+        return None, [], []
+    results = stored_results(handle)
+    if results is None:
+        return no_update, no_update, no_update
+    compared = compared or {'id': uuid.uuid4().hex, 'queries': []}
+    selected = selected or []
+    # Aggregating costs time in this query's rows only; the queries already compared are not touched.
+    aggregates = aggregate_store.get_or_compute(handle['digest'], handle.get('query') or "Query", results)
+    if all(query['value'] != aggregates.digest for query in compared['queries']):
+        compared['queries'].append({'label': f"{aggregates.label} ({aggregates.rows} results)",
+                                    'value': aggregates.digest})
+    if aggregates.digest not in selected:
+        selected = selected + [aggregates.digest]
+    return compared, compared['queries'], selected
+
+
+@app.callback(
+    Output("compare-verdicts-chart", "figure"),
+    Output("compare-sources-chart", "figure"),
+    Output("compare-timeline-chart", "figure"),
+    Input("compare-queries", "value"),
+    State("compare-store", "data"),
+    prevent_initial_call=True
+)
+def update_comparison_charts(selected, compared):
+    if not compared or not selected:
+        return [placeholder_figure("Add searches to compare")] * 3
+    return [comparison_memo.build(compared['id'], selected, builder)
+            for builder in (compare_verdicts_figure, compare_sources_figure, compare_timeline_figure)]
+
+
+@app.callback(
+    Output("compare-network-graph", "elements"),
+    Input("compare-queries", "value"),
+    Input("graph-checkbox", "value"),
+    Input("network-top-k-input", "value"),
+    Input("network-min-weight-input", "value"),
+    State("compare-store", "data"),
+    prevent_initial_call=True
+)
+def update_comparison_network(selected, graph_checkbox, network_top_k, network_min_weight, compared):
+    if not compared or not selected or 'ON' not in graph_checkbox:
+        return []
+    return comparison_memo.build(compared['id'], selected, comparison_network, top_k=network_top_k,
+                                 min_weight=network_min_weight)
 
 
 app.layout = dbc.Container(fluid=True, children=[
@@ -299,7 +402,7 @@ app.layout = dbc.Container(fluid=True, children=[
                 ),
                 dbc.Tooltip(
                     "Enabling this option will generate a network graph of sources and tags. "
-                    "Be cautious with large datasets as it might slow down the response.",
+                    "For large datasets, limit the graph with the top nodes or minimum edge weight options.",
                     target="graph-checkbox",
                     placement="right"
                 ),
@@ -310,10 +413,9 @@ app.layout = dbc.Container(fluid=True, children=[
         dbc.Col(html.Button("Search", id="search-button", n_clicks=0, className="btn btn-primary me-2"), width=1,
                 style={'font-family': 'monospace', 'background-color': '636efa'}),
         dbc.Col(
-            html.Button(
-                "Download CSV",
-                id="btn-download-csv",
-                n_clicks=0,
+            html.A(
+                "Download",
+                id="btn-download-results",
                 className="btn",
                 style={
                     'font-family': 'monospace',
@@ -324,8 +426,72 @@ app.layout = dbc.Container(fluid=True, children=[
             ),
             width=1
         ),
-        dcc.Download(id="download-csv"),
+        dcc.Store(id="result-store"),
+    ], justify="start"),
+    dbc.Row([
+        dbc.Col(dbc.Progress(id="search-progress", value=0, label="", striped=True, animated=True,
+                             style={'height': '20px'}), width=6, style={'font-family': 'monospace'}),
+        dbc.Col(html.Button("Cancel", id="btn-cancel-search", n_clicks=0, disabled=True, className="btn btn-secondary"),
+                width=1, style={'font-family': 'monospace'}),
+        dbc.Col(dcc.Dropdown(id="export-format", options=[
+            {"label": "CSV", "value": "csv"},
+            {"label": "CSV (gzip)", "value": "csv.gz"},
+            {"label": "Parquet", "value": "parquet"},
+            {"label": "NDJSON", "value": "ndjson"},
+        ], value="csv", clearable=False), width={"size": 1, "offset": 1}, style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Download format. Exports contain the results as fetched, with the original verdicts.",
+            target="export-format",
+            placement="top"
+        ),
+    ], justify="start", className="mt-2"),
+    dbc.Row([
+        dbc.Col(dbc.RadioItems(id="search-mode", options=[
+            {"label": "Remote", "value": "remote"},
+            {"label": "Local corpus", "value": "local"},
+            {"label": "Refresh since last fetch", "value": "refresh"},
+        ], value="remote", inline=True), width=6, style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Remote searches Fact Check Explorer and adds the results to the local corpus. Local corpus answers from "
+            "claims fetched before, without going online. "
+            "Refresh pulls only the newest results, then searches locally.",
+            target="search-mode",
+            placement="top"
+        ),
+        dbc.Col(dcc.DatePickerRange(id="date-range", clearable=True, start_date_placeholder_text="Reviewed from",
+                                    end_date_placeholder_text="Reviewed until"), width=4,
+                style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Review date filter for local corpus and refresh searches.",
+            target="date-range",
+            placement="top"
+        ),
+    ], justify="start", className="mt-2"),
+
+    html.Hr(),
+    html.H2("Batch", className="mb-3", style={'font-family': 'monospace'}),
+    dbc.Row([
+        dbc.Col(dcc.Upload(
+            id="batch-upload",
+            children=html.Div(["Drop or ", html.A("select"), " a query list (CSV with a 'query' column, or one per line)"],
+                              id="batch-upload-label"),
+            style={'borderWidth': '1px', 'borderStyle': 'dashed', 'borderRadius': '5px', 'textAlign': 'center',
+                   'padding': '6px'},
+        ), width=5, style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Rows without a language or number of results use the values of the search fields above.",
+            target="batch-upload",
+            placement="top"
+        ),
+        dbc.Col(html.Button("Run Batch", id="btn-run-batch", n_clicks=0, className="btn btn-primary me-2"), width=1,
+                style={'font-family': 'monospace'}),
+        dbc.Col(html.A("Download Batch", id="btn-download-batch", className="btn",
+                       style={'font-family': 'monospace', 'background-color': '#00cc96', 'color': '#FFFFFF',
+                              'border': 'none'}), width=2),
     ], justify="start"),
+    dbc.Row(dbc.Col(dbc.Progress(id="batch-progress", value=0, label="", striped=True, animated=True,
+                                 style={'height': '20px'}), width=6), className="mt-2"),
+    html.Div(id="batch-summary", className="mt-2", style={'font-family': 'monospace'}),
 
     html.Hr(),
     dbc.Row([
@@ -382,7 +548,20 @@ app.layout = dbc.Container(fluid=True, children=[
                 switch=True,
             ),
             dbc.Collapse(
-                dcc.Loading(dcc.Graph(id="claims-timeline")),
+                [
+                    dbc.RadioItems(id="timeline-mode", options=[
+                        {"label": "Bars", "value": "bars"},
+                        {"label": "Area", "value": "area"},
+                        {"label": "Points", "value": "points"},
+                    ], value="bars", inline=True, style={'font-family': 'monospace'}),
+                    dbc.Tooltip(
+                        "Bars and Area count claims per day, week or month depending on the time span. "
+                        "Points draws every claim.",
+                        target="timeline-mode",
+                        placement="top"
+                    ),
+                    dcc.Loading(dcc.Graph(id="claims-timeline")),
+                ],
                 id="collapse-claims-timeline",
                 is_open=True
             ),
@@ -405,6 +584,24 @@ app.layout = dbc.Container(fluid=True, children=[
     ], className="mb-4"),
     html.Hr(),
     html.P("Source > Node graph", className="mb-3", style={'font-family': 'monospace'}),
+    dbc.Row([
+        dbc.Col(dcc.Input(id="network-top-k-input", type="number", min=1, step=1,
+                          placeholder="Top nodes by degree (default: all)", className="form-control mb-2",
+                          debounce=True), width=3, style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Keep only the most connected sources and tags. Recommended for large searches.",
+            target="network-top-k-input",
+            placement="top"
+        ),
+        dbc.Col(dcc.Input(id="network-min-weight-input", type="number", min=1,
+                          placeholder="Min. edge weight (default: 1)", className="form-control mb-2", debounce=True),
+                width=3, style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Drop source-tag links that appear in fewer results than this.",
+            target="network-min-weight-input",
+            placement="top"
+        ),
+    ], justify="start"),
     dbc.Row(
 
         dbc.Col([
@@ -428,6 +625,43 @@ app.layout = dbc.Container(fluid=True, children=[
         ], width=12, className="mb-4", style={"border-right": "2px solid #dee2e6"}),
     ),
 
+    html.Hr(),
+    html.H2("Compare", className="mb-3", style={'font-family': 'monospace'}),
+    dbc.Row([
+        dbc.Col(html.Button("Add to Comparison", id="btn-add-compare", n_clicks=0, className="btn btn-primary me-2"),
+                width=2, style={'font-family': 'monospace'}),
+        dbc.Tooltip(
+            "Add the current search to the comparison. Queries are compared from their verdict, source, tag and date "
+            "counts, so a search can be compared after it was replaced by the next one.",
+            target="btn-add-compare",
+            placement="top"
+        ),
+        dbc.Col(dcc.Dropdown(id="compare-queries", options=[], value=[], multi=True,
+                             placeholder="Compared searches"), width=6, style={'font-family': 'monospace'}),
+        dbc.Col(html.Button("Clear", id="btn-clear-compare", n_clicks=0, className="btn btn-secondary"), width=1,
+                style={'font-family': 'monospace'}),
+        dcc.Store(id="compare-store"),
+    ], justify="start", className="mb-2"),
+    dbc.Row([
+        dbc.Col(dcc.Loading(dcc.Graph(id="compare-verdicts-chart")), width=6,
+                style={"border-right": "2px solid #dee2e6"}),
+        dbc.Col(dcc.Loading(dcc.Graph(id="compare-sources-chart")), width=6,
+                style={"border-right": "2px solid #dee2e6"}),
+    ], className="mb-4"),
+    dbc.Row(dbc.Col(dcc.Loading(dcc.Graph(id="compare-timeline-chart")), width=12), className="mb-4"),
+    html.P("Merged source > tag graph of the compared searches (uses the graph options above)", className="mb-3",
+           style={'font-family': 'monospace'}),
+    dbc.Row(dbc.Col(
+        cyto.Cytoscape(
+            id='compare-network-graph',
+            layout=layout,
+            style={'width': '100%', 'height': '400px'},
+            elements=[],
+            stylesheet=stylesheet
+        ),
+        width=12, className="mb-4"),
+    ),
+
     html.Hr(),
     html.H2("Fact Check Details", className="mb-3", style={'font-family': 'monospace'}),
     dbc.Row([
@@ -435,9 +669,13 @@ app.layout = dbc.Container(fluid=True, children=[
             id='factcheck-table',
             columns=[],
             data=[],
-            filter_action="native",
-            sort_action="native",
-            page_action="native",
+            filter_action="custom",
+            filter_query="",
+            sort_action="custom",
+            sort_mode="multi",
+            sort_by=[],
+            page_action="custom",
+            page_current=0,
             page_size=10,
             style_table={'overflowX': 'auto'},
             style_cell={
@@ -465,6 +703,7 @@ app.layout = dbc.Container(fluid=True, children=[
             },
         ), width=12),
     ]),
+    html.Div(id="table-filter-message", className="mt-2 text-danger", style={'font-family': 'monospace'}),
 ])
 
 
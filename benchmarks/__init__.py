@@ -0,0 +1 @@
+"""Offline benchmarks for the FEAT data pipeline. Run with ``python -m benchmarks.<name>``."""
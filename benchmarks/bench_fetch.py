@@ -0,0 +1,33 @@
+"""Wall-clock time of a paginated fetch against the local stub server, by chunk concurrency."""
+import argparse
+import time
+
+from benchmarks.common import install_factchecklib_stub
+from benchmarks.stub_server import start_server
+
+install_factchecklib_stub()
+
+from feat.fetch import PagedFetcher  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--results', type=int, default=10000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.2, help="simulated server latency per page (s)")
+    parser.add_argument('--fail-rate', type=float, default=0.05, help="share of pages answered with a 503")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency, fail_rate=args.fail_rate)
+    print(f"{'workers':>8} {'seconds':>8} {'claims':>7}")
+    for workers in [1, 2, 4, 8, 16]:
+        fetcher = PagedFetcher(url=url, page_size=args.page_size, max_workers=workers, per_host_limit=workers,
+                               backoff=0.05)
+        started = time.perf_counter()
+        claims = fetcher.fetch('benchmark', num_results=args.results)
+        print(f"{workers:>8} {time.perf_counter() - started:>8.2f} {len(claims):>7}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
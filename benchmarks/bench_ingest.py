@@ -0,0 +1,42 @@
+"""Compare the in-memory ingestion path against the old CSV write/read/delete round-trip."""
+import ast
+import csv
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks.common import install_factchecklib_stub, make_claims, measure
+
+install_factchecklib_stub()
+
+from feat.ingest import COLUMNS, result_from_claims  # noqa: E402
+
+SIZES = [100, 1000, 10000]
+
+
+def csv_round_trip(claims):
+    fd, csv_filename = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(claims)
+    df = pd.read_csv(csv_filename, encoding='utf-8')
+    df['Tags'] = df['Tags'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
+    df['Review Publication Date'] = pd.to_datetime(df['Review Publication Date'])
+    os.remove(csv_filename)
+    return df
+
+
+def main():
+    print(f"{'rows':>7} {'path':>10} {'best ms':>10} {'peak KiB':>10}")
+    for size in SIZES:
+        claims = make_claims(size)
+        for name, func in [('csv', csv_round_trip), ('in-memory', result_from_claims)]:
+            seconds, peak = measure(func, claims)
+            print(f"{size:>7} {name:>10} {seconds * 1000:>10.1f} {peak / 1024:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
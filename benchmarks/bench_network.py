@@ -0,0 +1,39 @@
+"""Benchmark the vectorized source–tag network against the old ``iterrows`` edge loop."""
+from benchmarks.common import install_factchecklib_stub, make_claims, measure
+
+install_factchecklib_stub()
+
+from feat.ingest import result_from_claims  # noqa: E402
+from feat.network import build_network  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+
+
+def legacy_network(df):
+    nodes = [{'data': {'id': src, 'label': src}, 'classes': 'source'} for src in df['Source Name'].unique()]
+    nodes += [{'data': {'id': tag, 'label': tag}, 'classes': 'tag'} for tag in set().union(*(df['Tags'].dropna()))]
+    added_edges = set()
+    edges = []
+    for _, row in df.iterrows():
+        src = row['Source Name']
+        for tag in row['Tags'] if isinstance(row['Tags'], list) else []:
+            if (src, tag) not in added_edges:
+                edges.append({'data': {'source': src, 'target': tag}})
+                added_edges.add((src, tag))
+    return nodes + edges
+
+
+def main():
+    print(f"{'rows':>7} {'builder':>12} {'best ms':>10} {'elements':>9}")
+    for size in SIZES:
+        result = result_from_claims(make_claims(size))
+        legacy_frame = result.to_frame(tags='list')
+        for name, func, data, kwargs in [('iterrows', legacy_network, legacy_frame, {}),
+                                         ('vectorized', build_network, result, {}),
+                                         ('top_k=150', build_network, result, {'top_k': 150})]:
+            seconds, _ = measure(func, data, **kwargs)
+            print(f"{size:>7} {name:>12} {seconds * 1000:>10.1f} {len(func(data, **kwargs)):>9}")
+
+
+if __name__ == '__main__':
+    main()
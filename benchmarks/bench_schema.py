@@ -0,0 +1,36 @@
+"""Memory of the compact ``ResultSet`` against the old object-dtype frame with list-valued ``Tags``."""
+import sys
+
+import pandas as pd
+
+from benchmarks.common import install_factchecklib_stub, make_claims
+
+install_factchecklib_stub()
+
+from feat.ingest import result_from_claims  # noqa: E402
+from feat.verdicts import default_normalizer, group_small_verdicts  # noqa: E402
+
+SIZES = [10000, 100000]
+
+
+def legacy_frame_bytes(claims):
+    df = pd.DataFrame.from_records(claims)
+    df['Verdict Grouped'] = df['Verdict']
+    # memory_usage(deep=True) only counts the list objects, not the tag strings they hold.
+    tag_bytes = sum(sys.getsizeof(tag) for tags in df['Tags'] for tag in tags)
+    return int(df.memory_usage(deep=True).sum()) + tag_bytes
+
+
+def main():
+    print(f"{'rows':>7} {'legacy MiB':>11} {'compact MiB':>12} {'tags MiB':>9}")
+    for size in SIZES:
+        claims = make_claims(size)
+        result = result_from_claims(claims)
+        result.frame['Verdict'] = default_normalizer.normalize(result.frame['Verdict'])
+        result.frame['Verdict Grouped'] = group_small_verdicts(result.frame['Verdict'])
+        print(f"{size:>7} {legacy_frame_bytes(claims) / 2 ** 20:>11.1f} {result.memory_usage() / 2 ** 20:>12.1f} "
+              f"{result.tags.nbytes / 2 ** 20:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
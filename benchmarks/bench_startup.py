@@ -0,0 +1,117 @@
+"""Cold-start cost of a worker: ``import app`` time and memory, warm-up time and first-search latency.
+
+Every run is a fresh interpreter, so nothing is already imported. Scenarios compare eager imports against lazy ones,
+with the first search either paying for the deferred imports itself or running after ``warm_up()``. ``--importtime``
+also lists the slowest imports (``python -X importtime``) of a cold ``import app``.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --importtime 15
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line.
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from benchmarks.common import install_factchecklib_stub
+install_factchecklib_stub()
+
+def peak_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+started = time.perf_counter()
+import app
+timings = {{'import_seconds': time.perf_counter() - started, 'import_peak_rss': peak_rss()}}
+if {warm_up!r}:
+    from feat.lazy import warm_up
+    timings['warm_up_seconds'] = warm_up()
+
+started = time.perf_counter()
+handle = app.run_search(lambda progress: None, 1, 'startup benchmark', None, {rows}, 'remote', None, None, None)[-1]
+result = app.result_store.get(handle['key'])
+for builder in (app.verdict_figure, app.tags_figure, app.timeline_figure, app.sources_figure):
+    builder(result).to_json()
+json.dumps(app.build_network(result))
+timings['first_search_seconds'] = time.perf_counter() - started
+timings['peak_rss'] = peak_rss()
+print(json.dumps(timings))
+"""
+
+# name: (FEAT_LAZY_IMPORTS, run warm_up() before the first search)
+SCENARIOS = [
+    ('eager imports', '0', False),
+    ('lazy, cold first search', '1', False),
+    ('lazy + warm-up', '1', True),
+]
+
+
+def run_child(lazy, warm_up, rows, workdir):
+    env = dict(os.environ, FEAT_LAZY_IMPORTS=lazy, FEAT_WARMUP='off', FEAT_METRICS_ENABLED='0',
+               FEAT_FETCH_PAGE_SIZE=str(max(rows, 1000)))
+    for variable, name in [('FEAT_CACHE_PATH', 'results.sqlite3'), ('FEAT_CORPUS_PATH', 'corpus.sqlite3'),
+                           ('FEAT_METRICS_PATH', 'metrics.sqlite3'), ('FEAT_STORE_DIR', 'store'),
+                           ('FEAT_JOBS_DIR', 'jobs'), ('FEAT_EXPORT_DIR', 'exports')]:
+        env[variable] = os.path.join(workdir, name)
+    code = CHILD.format(root=ROOT, warm_up=warm_up, rows=rows)
+    output = subprocess.run([sys.executable, '-c', code], env=env, cwd=workdir, check=True, capture_output=True,
+                            text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(top, workdir):
+    """The ``top`` slowest imports of ``import app`` as ``(cumulative seconds, module)``, slowest first."""
+    code = (f"import sys; sys.path.insert(0, {ROOT!r}); from benchmarks.common import install_factchecklib_stub; "
+            "install_factchecklib_stub(); import app")
+    env = dict(os.environ, FEAT_WARMUP='off', FEAT_METRICS_PATH=os.path.join(workdir, 'metrics.sqlite3'),
+               FEAT_CACHE_PATH=os.path.join(workdir, 'results.sqlite3'),
+               FEAT_CORPUS_PATH=os.path.join(workdir, 'corpus.sqlite3'))
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, cwd=workdir, check=True,
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)', line)
+        # Direct imports of top-level modules (each level indents by two), so a package is not counted again through
+        # its own imports.
+        if match and len(match.group(2)) == 3:
+            rows.append((int(match.group(1)) / 1e6, match.group(3)))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of the FEAT app.")
+    parser.add_argument('--rows', type=int, default=1000, help="results returned by the first search")
+    parser.add_argument('--repeat', type=int, default=3, help="fresh interpreters per scenario; the best one counts")
+    parser.add_argument('--importtime', type=int, default=0, metavar='N', help="also list the N slowest imports")
+    args = parser.parse_args(argv)
+
+    print(f"{'scenario':<26} {'import ms':>10} {'import MiB':>11} {'warm-up ms':>11} {'1st search ms':>14} "
+          f"{'peak MiB':>9}")
+    for name, lazy, warm_up in SCENARIOS:
+        runs = []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as workdir:
+                runs.append(run_child(lazy, warm_up, args.rows, workdir))
+        best = {key: min(run[key] for run in runs) for key in runs[0]}
+        warm = f"{best['warm_up_seconds'] * 1000:.0f}" if 'warm_up_seconds' in best else '-'
+        print(f"{name:<26} {best['import_seconds'] * 1000:>10.0f} {best['import_peak_rss'] / 2 ** 20:>11.1f} "
+              f"{warm:>11} {best['first_search_seconds'] * 1000:>14.0f} {best['peak_rss'] / 2 ** 20:>9.1f}")
+
+    if args.importtime:
+        with tempfile.TemporaryDirectory() as workdir:
+            profile = import_profile(args.importtime, workdir)
+        print("\nSlowest imports of a cold `import app` (lazy imports on):")
+        for seconds, module in profile:
+            print(f"{seconds * 1000:>8.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
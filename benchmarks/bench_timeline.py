@@ -0,0 +1,49 @@
+"""Payload size and build/serialize time of the bucketed timeline against the old one-marker-per-claim scatter.
+
+Browser render time grows with the number of SVG markers (or WebGL points) in the payload, so the figure JSON size
+and the number of plotted values are reported alongside the server-side build and ``to_json`` times.
+"""
+import plotly.express as px
+
+from benchmarks.common import install_factchecklib_stub, make_claims, measure
+
+install_factchecklib_stub()
+
+from feat.figures import timeline_figure  # noqa: E402
+from feat.ingest import result_from_claims  # noqa: E402
+from feat.verdicts import default_normalizer, group_small_verdicts  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+
+
+def legacy_timeline(result):
+    fig = px.scatter(result.frame, x='Review Publication Date', y='Verdict Grouped', color='Verdict Grouped',
+                     title='Timeline of Claims', labels={'Review Publication Date': 'Date'})
+    fig.update_layout(xaxis_title="Date", yaxis_title="Verdict")
+    return fig
+
+
+def build_and_serialize(builder, result, **kwargs):
+    return builder(result, **kwargs).to_json()
+
+
+def main():
+    print(f"{'rows':>7} {'figure':>14} {'build ms':>9} {'+json ms':>9} {'payload KiB':>12} {'values':>8}")
+    for size in SIZES:
+        result = result_from_claims(make_claims(size))
+        result.frame['Verdict'] = default_normalizer.normalize(result.frame['Verdict'])
+        result.frame['Verdict Grouped'] = group_small_verdicts(result.frame['Verdict'])
+        for name, builder, kwargs in [('scatter (old)', legacy_timeline, {}),
+                                      ('bars', timeline_figure, {'mode': 'bars'}),
+                                      ('area', timeline_figure, {'mode': 'area'}),
+                                      ('points (gl)', timeline_figure, {'mode': 'points'})]:
+            build, _ = measure(builder, result, **kwargs)
+            serialize, _ = measure(build_and_serialize, builder, result, **kwargs)
+            fig = builder(result, **kwargs)
+            values = sum(len(trace.x) for trace in fig.data)
+            print(f"{size:>7} {name:>14} {build * 1000:>9.1f} {serialize * 1000:>9.1f} "
+                  f"{len(fig.to_json()) / 1024:>12.1f} {values:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark the single-pass verdict normalizer against the old chained ``str.replace`` pipeline."""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import VERDICTS
+from feat.legacy import legacy_normalize
+from feat.verdicts import VerdictNormalizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    raw = VERDICTS + [f'{v} ({i})' for i, v in enumerate(VERDICTS)]
+    rng = np.random.default_rng(0)
+    verdicts = pd.Series(np.array(raw, dtype=object)[rng.integers(0, len(raw), args.rows)], name='Verdict')
+
+    started = time.perf_counter()
+    legacy_normalize(verdicts)
+    legacy_seconds = time.perf_counter() - started
+
+    normalizer = VerdictNormalizer()
+    started = time.perf_counter()
+    normalizer.normalize(verdicts)
+    seconds = time.perf_counter() - started
+
+    print(f"rows: {args.rows}")
+    print(f"legacy str.replace chain: {legacy_seconds:8.3f} s")
+    print(f"single-pass normalizer:   {seconds:8.3f} s  ({legacy_seconds / seconds:.0f}x)")
+    differing = sorted({(r, o, n) for r, o, n in zip(raw, legacy_normalize(pd.Series(raw)), normalizer.normalize(
+        pd.Series(raw))) if o != n})
+    print(f"distinct raw verdicts normalized differently: {len(differing)}")
+    for raw_verdict, old, new in differing:
+        print(f"  {raw_verdict!r}: {old!r} -> {new!r}")
+
+
+if __name__ == '__main__':
+    main()
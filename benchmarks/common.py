@@ -0,0 +1,104 @@
+"""Shared helpers for the benchmarks: synthetic claims and an offline FactCheckLib stub."""
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import types
+from datetime import datetime, timedelta
+
+VERDICTS = ['False', 'false.', 'Falso', 'Fake', 'Mostly True', 'Misleading', 'True', 'Verdadero', "C'est faux",
+            'Pants on Fire', 'Partialmente falso', 'Doğru', 'Неверно', 'Engañoso', 'Half True', 'Missing context']
+# Relative frequency of each verdict: English and Spanish "false" ratings dominate, as in real result sets.
+VERDICT_WEIGHTS = [30, 6, 14, 5, 4, 8, 5, 2, 3, 2, 2, 1, 1, 6, 3, 8]
+SOURCES = [f'Source {i}' for i in range(200)]
+TAGS = [f'tag{i}' for i in range(500)]
+# Zipf-distributed tag popularity: a few topics appear on many claims, most on a handful.
+_TAG_CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(TAGS) + 1)))
+_VERDICT_CUM_WEIGHTS = list(itertools.accumulate(VERDICT_WEIGHTS))
+
+# Benchmarks time the pipeline itself, not writes to the /metrics store.
+os.environ.setdefault('FEAT_METRICS_ENABLED', '0')
+
+
+def make_claims(n, seed=0, offset=0):
+    """Generate ``n`` claim dicts shaped like ``FactCheckLib.extract_info`` output.
+
+    Claim ``i`` only depends on ``seed`` and ``i``, so ``offset`` yields the same claims a larger set holds there.
+    """
+    start = datetime(2018, 1, 1)
+    claims = []
+    for i in range(offset, offset + n):
+        rng = random.Random(seed * 1_000_003 + i)
+        # Zipf-like skew: a handful of sources publish most of the checks.
+        source = SOURCES[min(int(rng.paretovariate(1.2)) - 1, len(SOURCES) - 1)]
+        claims.append({
+            'Claim': f'Synthetic claim number {i} about topic {rng.randint(0, 50)}',
+            'Source Name': source,
+            'Source URL': f'https://example.org/{source.replace(" ", "-").lower()}/{i}',
+            'Verdict': rng.choices(VERDICTS, cum_weights=_VERDICT_CUM_WEIGHTS)[0],
+            'Review Publication Date': (start + timedelta(days=rng.randint(0, 2000))).strftime('%Y-%m-%d %H:%M:%S'),
+            'Image URL': f'https://example.org/img/{i}.jpg',
+            'Tags': list(dict.fromkeys(rng.choices(TAGS, cum_weights=_TAG_CUM_WEIGHTS, k=rng.randint(0, 5)))),
+        })
+    return claims
+
+
+def encode_response(claims):
+    """Encode claims as a response body the stub ``FactCheckLib`` parses, with the API's XSSI prefix."""
+    return ")]}'\n" + json.dumps(claims)
+
+
+def install_factchecklib_stub(claims_factory=make_claims):
+    """Register a fake ``factcheckexplorer`` module so the pipeline runs without network access."""
+    if 'factcheckexplorer.factcheckexplorer' in sys.modules:
+        return
+
+    class FactCheckLib:
+        url = 'https://toolbox.google.com/factcheck/api/search'
+
+        def __init__(self, query, language=None, num_results=100, csv_filename=None):
+            self.query = query
+            self.language = language
+            self.num_results = int(num_results)
+            self.params = {'query': query, 'num_results': str(num_results), 'offset': '0', 'force': 'false'}
+            self.headers = {}
+
+        def fetch_data(self):
+            return encode_response(claims_factory(self.num_results))
+
+        @staticmethod
+        def clean_json(raw_json):
+            return json.loads(raw_json.lstrip(")]}'\n"))
+
+        def extract_info(self, data):
+            return data
+
+    package = types.ModuleType('factcheckexplorer')
+    module = types.ModuleType('factcheckexplorer.factcheckexplorer')
+    module.FactCheckLib = FactCheckLib
+    package.factcheckexplorer = module
+    sys.modules['factcheckexplorer'] = package
+    sys.modules['factcheckexplorer.factcheckexplorer'] = module
+
+
+def measure(func, *args, repeat=3, **kwargs):
+    """Return (best wall-clock seconds, peak traced bytes) of ``func``.
+
+    The time is the best of ``repeat`` untraced runs; the peak comes from one extra run under ``tracemalloc``, which
+    would otherwise slow the timed runs down.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
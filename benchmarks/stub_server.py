@@ -0,0 +1,68 @@
+"""Local stand-in for the Fact Check Explorer search API, for offline fetch benchmarks.
+
+Responses are replayed from a directory of recorded bodies named ``<offset>-<num_results>.txt`` when one is given,
+and generated with ``make_claims`` otherwise. Latency and a rate of transient 503 errors can be injected.
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.common import encode_response, make_claims
+
+
+def make_handler(replay_dir=None, latency=0.0, fail_rate=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlsplit(self.path).query)
+            offset = int(params.get('offset', ['0'])[0])
+            num_results = int(params.get('num_results', ['100'])[0])
+            time.sleep(latency)
+            if random.random() < fail_rate:
+                self.send_error(503)
+                return
+            recorded = os.path.join(replay_dir or '', f'{offset}-{num_results}.txt')
+            if replay_dir and os.path.exists(recorded):
+                with open(recorded, 'rb') as f:
+                    body = f.read()
+            else:
+                body = encode_response(make_claims(num_results, offset=offset)).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(replay_dir=None, latency=0.0, fail_rate=0.0, port=0):
+    """Serve in a daemon thread and return ``(server, search URL)``."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(replay_dir, latency, fail_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/factcheck/api/search'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--replay-dir')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    server, url = start_server(args.replay_dir, args.latency, args.fail_rate, args.port)
+    print(f"Serving {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Time every stage of a search, from response parsing to table serialization, against a stored baseline.
+
+Runs fully offline on synthetic result sets (see ``benchmarks.common.make_claims``) at several sizes and reports,
+per stage and size, the best wall-clock time, throughput, peak traced memory and payload size. Results are compared
+with ``benchmarks/baseline.json``; a stage more than ``--tolerance`` and ``MIN_DELTA`` seconds slower than its
+baseline is flagged, and ``--check`` turns flagged stages into a non-zero exit status.
+
+    python -m benchmarks.suite                      # compare against the stored baseline
+    python -m benchmarks.suite --save-baseline      # record a new baseline on this machine
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+
+from benchmarks.common import encode_response, install_factchecklib_stub, make_claims, measure
+
+install_factchecklib_stub()
+
+import pandas as pd  # noqa: E402
+import plotly  # noqa: E402
+from factcheckexplorer.factcheckexplorer import FactCheckLib  # noqa: E402
+
+from feat.figures import sources_figure, tags_figure, timeline_figure, verdict_figure  # noqa: E402
+from feat.ingest import result_from_claims  # noqa: E402
+from feat.network import build_network  # noqa: E402
+from feat.table import table_page  # noqa: E402
+from feat.verdicts import default_normalizer, group_small_verdicts  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# Differences below this many seconds are timer and scheduler noise, whatever their ratio.
+MIN_DELTA = 0.005
+
+
+def parse(body):
+    fact_check_lib = FactCheckLib(query='benchmark')
+    return result_from_claims(fact_check_lib.extract_info(fact_check_lib.clean_json(body)))
+
+
+def normalize(result):
+    verdicts = default_normalizer.normalize(result.frame['Verdict'])
+    return verdicts, group_small_verdicts(verdicts)
+
+
+def figure_json(builder, **params):
+    return lambda result: builder(result, **params).to_json()
+
+
+def network_json(**params):
+    return lambda result: json.dumps(build_network(result, **params))
+
+
+def table_json(result):
+    records, page_count = table_page(result, 3, 10, [{'column_id': 'Review Publication Date', 'direction': 'desc'}],
+                                     '{Tags} contains tag1 && {Verdict} ne true')
+    return json.dumps({'data': records, 'page_count': page_count}, default=str)
+
+
+# name: function of the stage input; payload-producing stages return the serialized payload.
+STAGES = [
+    ('figure:verdict', figure_json(verdict_figure)),
+    ('figure:tags', figure_json(tags_figure)),
+    ('figure:timeline', figure_json(timeline_figure)),
+    ('figure:timeline_points', figure_json(timeline_figure, mode='points')),
+    ('figure:sources', figure_json(sources_figure)),
+    ('network', network_json()),
+    ('network:top_k=150', network_json(top_k=150)),
+    ('table_page', table_json),
+]
+
+
+def run(sizes, repeat):
+    results = {}
+
+    def record(stage, size, seconds, peak, payload=None):
+        results[f'{stage}@{size}'] = {'stage': stage, 'rows': size, 'seconds': seconds, 'peak_bytes': peak,
+                                      'payload_bytes': len(payload) if payload is not None else None}
+
+    for size in sizes:
+        body = encode_response(make_claims(size))
+        seconds, peak = measure(parse, body, repeat=repeat)
+        record('parse', size, seconds, peak)
+
+        result = parse(body)
+        seconds, peak = measure(normalize, result, repeat=repeat)
+        record('normalize_verdicts', size, seconds, peak)
+        result.raw_verdicts = result.frame['Verdict']
+        result.frame['Verdict'], result.frame['Verdict Grouped'] = normalize(result)
+
+        for stage, func in STAGES:
+            # The untimed first call also warms up lazily imported plotly modules.
+            payload = func(result)
+            seconds, peak = measure(func, result, repeat=repeat)
+            record(stage, size, seconds, peak, payload)
+    return results
+
+
+def environment():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'pandas': pd.__version__,
+            'plotly': plotly.__version__}
+
+
+def report(results, baseline, tolerance):
+    """Print one line per stage and size; return the keys that regressed against ``baseline``."""
+    regressions = []
+    print(f"{'rows':>7} {'stage':<24} {'best ms':>9} {'rows/s':>11} {'peak MiB':>9} {'payload KiB':>12} "
+          f"{'baseline ms':>12} {'ratio':>6}")
+    for key, entry in results.items():
+        base = baseline.get(key)
+        ratio = entry['seconds'] / base['seconds'] if base and base['seconds'] else None
+        flag = ''
+        if ratio is not None and ratio > 1 + tolerance and entry['seconds'] - base['seconds'] > MIN_DELTA:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        payload = f"{entry['payload_bytes'] / 1024:.1f}" if entry['payload_bytes'] is not None else '-'
+        print(f"{entry['rows']:>7} {entry['stage']:<24} {entry['seconds'] * 1000:>9.1f} "
+              f"{entry['rows'] / entry['seconds']:>11,.0f} {entry['peak_bytes'] / 2 ** 20:>9.1f} {payload:>12} "
+              f"{base['seconds'] * 1000 if base else float('nan'):>12.1f} "
+              f"{ratio if ratio is not None else float('nan'):>6.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the FEAT search pipeline.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="result set sizes to benchmark")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per stage; the best one counts")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="slowdown against the baseline that counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--check', action='store_true', help="exit with status 1 if any stage regressed")
+    parser.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            stored = json.load(f)
+        baseline = stored['results']
+        if stored.get('environment') != environment():
+            print(f"Note: baseline was recorded on {stored.get('environment')}; timings may not be comparable.")
+
+    results = run(args.sizes, args.repeat)
+    regressions = report(results, baseline, args.tolerance)
+
+    document = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} stage(s) more than {args.tolerance:.0%} slower than the baseline: "
+              + ', '.join(regressions))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Data layer for the FEAT dashboard."""
@@ -0,0 +1,189 @@
+"""Batch mode: run a list of queries through the search pipeline and stream the results to Parquet.
+
+Each finished query is written straight away as its own files in a Hive-partitioned Parquet dataset
+(``<output>/query=<query>/...``), so memory stays bounded by the queries in flight rather than growing with the
+batch. Read the dataset back with ``pandas.read_parquet(output)``; the partition restores the ``query`` column.
+
+Usage::
+
+    python -m feat.batch queries.csv --output batch_results --workers 4
+
+The input is either a CSV file with a ``query`` column and optional ``language`` and ``num_results`` columns, or a
+plain text file with one query per line.
+
+Batches run from the dashboard are downloaded as one zip from ``GET /batch/<id>.zip``, see ``register_batch_routes``.
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+from flask import abort, send_file
+
+from feat.lazy import lazy_import
+from feat.pipeline import search_results
+
+pa = lazy_import('pyarrow')
+pq = lazy_import('pyarrow.parquet')
+
+MAX_WORKERS = int(os.environ.get('FEAT_BATCH_WORKERS', 4))
+
+
+def parse_queries(text, language=None, num_results=100):
+    """Parse batch input (CSV with a ``query`` header, or one query per line) into query specs."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    if 'query' in next(csv.reader([lines[0]])):
+        rows = csv.DictReader(io.StringIO('\n'.join(lines)))
+    else:
+        rows = ({'query': line} for line in lines)
+    queries = []
+    for row in rows:
+        if not (row.get('query') or '').strip():
+            continue
+        queries.append({
+            'query': row['query'].strip(),
+            'language': (row.get('language') or '').strip() or language,
+            'num_results': _num_results(row.get('num_results'), num_results or 100, row['query'].strip()),
+        })
+    return queries
+
+
+def _num_results(value, default, query):
+    value = (value or '').strip()
+    if not value:
+        return default
+    try:
+        if int(value) >= 1:
+            return int(value)
+    except ValueError:
+        pass
+    print(f"Invalid num_results {value!r} for query {query!r}; using {default}")
+    return default
+
+
+def evict_batches(batch_dir, max_age):
+    """Remove batch datasets and archives in ``batch_dir`` last modified more than ``max_age`` seconds ago."""
+    if not os.path.isdir(batch_dir):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(batch_dir):
+        try:
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def batch_archive(batch_dir, batch_id):
+    """Path of the zip of the dataset ``batch_id``, built on first use and then kept next to it until it expires."""
+    dataset = os.path.join(batch_dir, batch_id)
+    path = f'{dataset}.zip'
+    if not os.path.exists(path):
+        # Built under a temporary name, so concurrent downloads never serve a half-written archive.
+        tmp_base = f'{dataset}.{uuid.uuid4().hex}.tmp'
+        try:
+            os.replace(shutil.make_archive(tmp_base, 'zip', dataset), path)
+        finally:
+            if os.path.exists(f'{tmp_base}.zip'):
+                os.remove(f'{tmp_base}.zip')
+    return path
+
+
+def register_batch_routes(server, batch_dir):
+    """Add the ``/batch/<id>.zip`` route to the Flask ``server``, serving batches run into ``batch_dir``."""
+    # Absolute, because send_file resolves relative paths against the app's root path rather than the working directory.
+    batch_dir = os.path.abspath(batch_dir)
+
+    @server.route('/batch/<batch_id>.zip')
+    def download_batch(batch_id):
+        if not re.fullmatch(r'[0-9a-f]{32}', batch_id) or not os.path.isdir(os.path.join(batch_dir, batch_id)):
+            abort(404)
+        return send_file(batch_archive(batch_dir, batch_id), mimetype='application/zip', as_attachment=True,
+                         download_name=f'feat_batch_{batch_id[:8]}.zip', conditional=True)
+
+    return download_batch
+
+
+def write_partition(result, output_dir, query, language):
+    df = result.to_frame(tags='list').assign(query=query, language=language or 'all')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(table, output_dir, partition_cols=['query'],
+                        basename_template=f'{uuid.uuid4().hex}-{{i}}.parquet')
+
+
+def run_batch(queries, output_dir, max_workers=MAX_WORKERS, cache=None, corpus=None, fetch_guard=None,
+              progress=None):
+    """Run ``queries`` on a pool of ``max_workers`` threads, appending each result to the dataset in ``output_dir``.
+
+    ``fetch_guard`` is an optional context manager factory held around each fetch (e.g. ``feat.jobs.fetch_slot``);
+    ``progress(done, total)`` is called after each query. Returns one summary dict per query, in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    summaries = [None] * len(queries)
+
+    def run_one(spec):
+        with (fetch_guard() if fetch_guard is not None else nullcontext()):
+            result = search_results(spec['query'], spec['language'], spec['num_results'], cache=cache,
+                                    corpus=corpus)
+        write_partition(result, output_dir, spec['query'], spec['language'])
+        return len(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_one, spec): i for i, spec in enumerate(queries)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            summary = dict(queries[i], results=0, error=None)
+            try:
+                summary['results'] = future.result()
+            except Exception as e:
+                print(f"Error processing batch query {queries[i]['query']!r}: {e}")
+                summary['error'] = str(e)
+            summaries[i] = summary
+            if progress is not None:
+                progress(done, len(queries))
+    return summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a batch of FEAT searches into a partitioned Parquet dataset.")
+    parser.add_argument('input', help="CSV with a 'query' column (optionally 'language', 'num_results'), or a "
+                                      "text file with one query per line")
+    parser.add_argument('--output', '-o', required=True, help="output dataset directory")
+    parser.add_argument('--language', help="language for rows that do not set one (default: all)")
+    parser.add_argument('--num-results', type=int, default=100, help="results per query for rows that do not set it")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="queries run in parallel")
+    parser.add_argument('--no-cache', action='store_true', help="bypass the persistent result cache")
+    parser.add_argument('--no-corpus', action='store_true', help="do not add results to the local corpus")
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding='utf-8') as f:
+        queries = parse_queries(f.read(), args.language, args.num_results)
+    cache = None
+    if not args.no_cache:
+        from feat.cache import ResultCache
+        cache = ResultCache()
+    corpus = None
+    if not args.no_corpus:
+        from feat.corpus import Corpus
+        corpus = Corpus()
+    summaries = run_batch(queries, args.output, max_workers=args.workers, cache=cache, corpus=corpus,
+                          progress=lambda done, total: print(f"{done}/{total} queries done", flush=True))
+    for summary in summaries:
+        status = f"error: {summary['error']}" if summary['error'] else f"{summary['results']} results"
+        print(f"{summary['query']!r} ({summary['language'] or 'all'}): {status}")
+
+
+if __name__ == '__main__':
+    main()
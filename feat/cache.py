@@ -0,0 +1,94 @@
+"""Persistent query-result cache shared by every worker process.
+
+Results are stored in a local SQLite database keyed on (query, language, num_results) with a TTL and a
+size-bounded LRU eviction policy. A request for fewer results than a cached entry holds is served by slicing it.
+"""
+import json
+import os
+import time
+import zlib
+
+from feat.storage import SQLiteStore, evict_lru
+
+DEFAULT_PATH = os.environ.get('FEAT_CACHE_PATH', os.path.join('.feat_cache', 'results.sqlite3'))
+DEFAULT_TTL = int(os.environ.get('FEAT_CACHE_TTL', 3600))
+DEFAULT_MAX_BYTES = int(os.environ.get('FEAT_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    query TEXT NOT NULL,
+    language TEXT NOT NULL,
+    num_results INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (query, language, num_results)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+
+def cache_key(query, language, num_results):
+    return query.strip().lower(), (language or 'all').strip().lower(), int(num_results or 100)
+
+
+class ResultCache(SQLiteStore):
+    schema = _SCHEMA
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        super().__init__(path)
+
+    def get(self, query, language, num_results):
+        """Return the cached claims for the key, or ``None`` on a miss.
+
+        Any live entry for the same query and language with at least ``num_results`` results is a hit; the
+        smallest such entry is sliced down to the requested size.
+        """
+        query, language, num_results = cache_key(query, language, num_results)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT num_results, payload FROM results '
+                'WHERE query = ? AND language = ? AND num_results >= ? AND created >= ? '
+                'ORDER BY num_results LIMIT 1',
+                (query, language, num_results, now - self.ttl)).fetchone()
+            if row is None:
+                conn.execute("UPDATE stats SET value = value + 1 WHERE name = 'misses'")
+                return None
+            conn.execute('UPDATE results SET accessed = ? WHERE query = ? AND language = ? AND num_results = ?',
+                         (now, query, language, row[0]))
+            conn.execute("UPDATE stats SET value = value + 1 WHERE name = 'hits'")
+        return json.loads(zlib.decompress(row[1]))[:num_results]
+
+    def put(self, query, language, num_results, claims):
+        query, language, num_results = cache_key(query, language, num_results)
+        payload = zlib.compress(json.dumps(claims, default=str).encode('utf-8'))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                         (query, language, num_results, now, now, len(payload), payload))
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        expired = conn.execute('DELETE FROM results WHERE created < ?', (now - self.ttl,)).rowcount
+        rows = conn.execute('SELECT accessed, size, query, language, num_results FROM results').fetchall()
+        evicted = evict_lru([(accessed, size, key) for accessed, size, *key in rows], self.max_bytes,
+                            lambda key: conn.execute(
+                                'DELETE FROM results WHERE query = ? AND language = ? AND num_results = ?', key))
+        conn.execute("UPDATE stats SET value = value + ? WHERE name = 'evictions'", (expired + evicted,))
+
+    def stats(self):
+        with self._connect() as conn:
+            stats = dict(conn.execute('SELECT name, value FROM stats').fetchall())
+            stats['entries'], stats['bytes'] = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        return stats
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM results')
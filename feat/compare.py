@@ -0,0 +1,229 @@
+"""Cross-query comparison built from per-query aggregates.
+
+A query's ``QueryAggregates`` (verdict and source counts, claims per review day and source–tag pair counts) are
+computed once from its ``ResultSet`` and kept in a SQLite file shared by all workers, keyed on the result digest, so
+they outlive the result itself. A ``Comparison`` merges the aggregates of several queries and is updated in place as
+queries are added or removed: each step costs time in the size of that one query's aggregates, and the raw rows of
+the other queries are never read again.
+"""
+import json
+import os
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from feat.lazy import lazy_import
+from feat.metrics import stage
+from feat.network import network_elements, prune_network
+from feat.schema import TAGS_COLUMN
+from feat.storage import SQLiteStore, evict_lru
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+DEFAULT_PATH = os.environ.get('FEAT_COMPARE_PATH', os.path.join('.feat_cache', 'aggregates.sqlite3'))
+DEFAULT_MAX_BYTES = int(os.environ.get('FEAT_COMPARE_MAX_BYTES', 64 * 1024 * 1024))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aggregates (
+    digest TEXT PRIMARY KEY,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS aggregates_accessed ON aggregates (accessed);
+"""
+
+
+def _counts(series):
+    return {str(key): int(value) for key, value in series.items() if value > 0}
+
+
+class QueryAggregates:
+    """Everything the comparison view needs to know about one query's results, as plain count dicts."""
+
+    def __init__(self, digest, label, rows, verdicts, sources, days, pairs):
+        self.digest = digest
+        self.label = label
+        self.rows = rows
+        self.verdicts = verdicts
+        self.sources = sources
+        # 'YYYY-MM-DD' review day -> claims
+        self.days = days
+        # (source, tag) -> claims of that source carrying that tag
+        self.pairs = pairs
+
+    @classmethod
+    def from_result(cls, result, digest, label):
+        frame = result.frame
+        dates = frame['Review Publication Date'].values
+        days, day_counts = np.unique(dates[~np.isnat(dates)].astype('datetime64[D]'), return_counts=True)
+        pairs = result.source_tag_pairs().dropna().groupby(['Source Name', TAGS_COLUMN], observed=True).size()
+        return cls(digest, label, len(result),
+                   verdicts=_counts(frame['Verdict'].value_counts()),
+                   sources=_counts(frame['Source Name'].value_counts()),
+                   days=dict(zip(np.datetime_as_string(days).tolist(), day_counts.tolist())),
+                   pairs={(str(source), str(tag)): int(n) for (source, tag), n in pairs.items()})
+
+    def to_payload(self):
+        document = {'digest': self.digest, 'label': self.label, 'rows': self.rows, 'verdicts': self.verdicts,
+                    'sources': self.sources, 'days': self.days,
+                    'pairs': [[source, tag, n] for (source, tag), n in self.pairs.items()]}
+        return zlib.compress(json.dumps(document, ensure_ascii=False).encode('utf-8'))
+
+    @classmethod
+    def from_payload(cls, payload):
+        document = json.loads(zlib.decompress(payload))
+        document['pairs'] = {(source, tag): n for source, tag, n in document['pairs']}
+        # Aggregates stored before tag counts were dropped still carry them.
+        document.pop('tags', None)
+        return cls(**document)
+
+
+class AggregateStore(SQLiteStore):
+    """Per-query aggregates keyed on result digest, in a size-bounded SQLite file shared by all workers."""
+
+    schema = _SCHEMA
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        super().__init__(path)
+
+    def get(self, digest):
+        """Return the aggregates stored for ``digest``, or ``None`` if they were evicted or never computed."""
+        with self._connect() as conn:
+            row = conn.execute('SELECT payload FROM aggregates WHERE digest = ?', (digest,)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE aggregates SET accessed = ? WHERE digest = ?', (time.time(), digest))
+        return QueryAggregates.from_payload(row[0])
+
+    def put(self, aggregates):
+        payload = aggregates.to_payload()
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO aggregates VALUES (?, ?, ?, ?)',
+                         (aggregates.digest, time.time(), len(payload), payload))
+            self._evict(conn)
+
+    def get_or_compute(self, digest, label, result):
+        """Aggregates of ``result``, computed (in time proportional to its rows) only if none are stored yet."""
+        aggregates = self.get(digest)
+        if aggregates is None:
+            with stage('compare_aggregate', rows=len(result)):
+                aggregates = QueryAggregates.from_result(result, digest, label)
+            self.put(aggregates)
+        return aggregates
+
+    def _evict(self, conn):
+        evict_lru(conn.execute('SELECT accessed, size, digest FROM aggregates').fetchall(), self.max_bytes,
+                  lambda digest: conn.execute('DELETE FROM aggregates WHERE digest = ?', (digest,)))
+
+    def stats(self):
+        with self._connect() as conn:
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM aggregates').fetchone()
+        return {'entries': entries, 'bytes': size}
+
+
+def _subtract(totals, counts):
+    for key, value in counts.items():
+        totals[key] -= value
+        if totals[key] <= 0:
+            del totals[key]
+
+
+class Comparison:
+    """Merged aggregates of the compared queries, kept in the order they were added."""
+
+    def __init__(self):
+        self.queries = OrderedDict()
+        self.verdicts = Counter()
+        self.sources = Counter()
+        # source -> number of compared queries it appears in
+        self.source_queries = Counter()
+        self.shared_sources = 0
+        self.pairs = Counter()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return sum(aggregates.rows for aggregates in self.queries.values())
+
+    def add(self, aggregates):
+        if aggregates.digest in self.queries:
+            return
+        self.queries[aggregates.digest] = aggregates
+        self.verdicts.update(aggregates.verdicts)
+        self.sources.update(aggregates.sources)
+        for source in aggregates.sources:
+            self.source_queries[source] += 1
+            if self.source_queries[source] == 2:
+                self.shared_sources += 1
+        self.pairs.update(aggregates.pairs)
+
+    def remove(self, digest):
+        aggregates = self.queries.pop(digest, None)
+        if aggregates is None:
+            return
+        _subtract(self.verdicts, aggregates.verdicts)
+        _subtract(self.sources, aggregates.sources)
+        for source in aggregates.sources:
+            if self.source_queries[source] == 2:
+                self.shared_sources -= 1
+        _subtract(self.source_queries, dict.fromkeys(aggregates.sources, 1))
+        _subtract(self.pairs, aggregates.pairs)
+
+    def labels(self):
+        """Query labels, made unique with a ``#n`` suffix where two queries share one."""
+        seen = Counter()
+        labels = []
+        for aggregates in self.queries.values():
+            seen[aggregates.label] += 1
+            labels.append(aggregates.label if seen[aggregates.label] == 1
+                          else f"{aggregates.label} #{seen[aggregates.label]}")
+        return labels
+
+
+def comparison_network(comparison, top_k=None, min_weight=1):
+    """Cytoscape ``elements`` of the source–tag network of all compared queries together, see ``build_network``."""
+    edges = pd.DataFrame([(source, tag, weight) for (source, tag), weight in comparison.pairs.items()],
+                         columns=['source', 'target', 'weight'])
+    edges['weight'] = edges['weight'].astype('int64')
+    return network_elements(*prune_network(edges, top_k=top_k, min_weight=min_weight,
+                                           sources=list(comparison.sources)))
+
+
+class ComparisonMemo:
+    """Per-worker LRU of ``Comparison`` objects, keyed on the comparison id the browser holds.
+
+    ``build`` brings a comparison in line with the selected digests by adding and removing only the queries that
+    changed. A worker that has not seen the comparison yet rebuilds it from the stored aggregates.
+    """
+
+    def __init__(self, store, max_entries=32):
+        self.store = store
+        self.max_entries = max_entries
+        self._comparisons = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _comparison(self, comparison_id):
+        with self._lock:
+            comparison = self._comparisons.get(comparison_id)
+            if comparison is None:
+                comparison = self._comparisons[comparison_id] = Comparison()
+            self._comparisons.move_to_end(comparison_id)
+            while len(self._comparisons) > self.max_entries:
+                self._comparisons.popitem(last=False)
+        return comparison
+
+    def build(self, comparison_id, digests, builder, **params):
+        comparison = self._comparison(comparison_id)
+        with comparison.lock:
+            for digest in [digest for digest in comparison.queries if digest not in digests]:
+                comparison.remove(digest)
+            for digest in digests:
+                if digest not in comparison.queries:
+                    aggregates = self.store.get(digest)
+                    if aggregates is not None:
+                        comparison.add(aggregates)
+            with stage(builder.__name__, rows=len(comparison)):
+                return builder(comparison, **params)
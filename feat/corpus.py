@@ -0,0 +1,198 @@
+"""Local fact-check corpus with a full-text index.
+
+Every remote fetch is added to a SQLite database, de-duplicated by review URL, with an FTS5 index over claim text,
+source and tags. The corpus can answer a query with language and review-date filters locally, and can be refreshed
+incrementally by pulling only the newest pages of a search until they contain nothing new or nothing reviewed since
+the search was last fetched.
+
+FactCheckLib results carry no per-claim language, so a claim's language is the language of the search that first
+returned it (``NULL`` for searches across all languages).
+"""
+import hashlib
+import json
+import os
+import time
+
+from feat.lazy import lazy_import
+from feat.storage import SQLiteStore
+
+pd = lazy_import('pandas')
+
+DEFAULT_PATH = os.environ.get('FEAT_CORPUS_PATH', os.path.join('.feat_cache', 'corpus.sqlite3'))
+REFRESH_PAGE_SIZE = int(os.environ.get('FEAT_CORPUS_REFRESH_PAGE_SIZE', 100))
+REFRESH_OVERLAP_DAYS = int(os.environ.get('FEAT_CORPUS_REFRESH_OVERLAP_DAYS', 7))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    claim TEXT,
+    source_name TEXT,
+    source_url TEXT,
+    verdict TEXT,
+    review_date TEXT,
+    review_ts REAL,
+    image_url TEXT,
+    tags TEXT NOT NULL DEFAULT '[]',
+    language TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS claims_review_ts ON claims (review_ts);
+CREATE INDEX IF NOT EXISTS claims_language ON claims (language);
+CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts USING fts5(
+    claim, source_name, tags, content='claims', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS claims_ai AFTER INSERT ON claims BEGIN
+    INSERT INTO claims_fts (rowid, claim, source_name, tags) VALUES (new.id, new.claim, new.source_name, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS claims_ad AFTER DELETE ON claims BEGIN
+    INSERT INTO claims_fts (claims_fts, rowid, claim, source_name, tags)
+    VALUES ('delete', old.id, old.claim, old.source_name, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS claims_au AFTER UPDATE OF claim, source_name, tags ON claims BEGIN
+    INSERT INTO claims_fts (claims_fts, rowid, claim, source_name, tags)
+    VALUES ('delete', old.id, old.claim, old.source_name, old.tags);
+    INSERT INTO claims_fts (rowid, claim, source_name, tags) VALUES (new.id, new.claim, new.source_name, new.tags);
+END;
+CREATE TABLE IF NOT EXISTS fetches (
+    query TEXT NOT NULL,
+    language TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    PRIMARY KEY (query, language)
+);
+"""
+
+
+def claim_url(claim):
+    """Identity of a claim in the corpus: its review URL, or a hash of source and text when there is none."""
+    if claim.get('Source URL'):
+        return claim['Source URL']
+    text = f"{claim.get('Source Name')}\x1f{claim.get('Claim')}"
+    return 'sha1:' + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def match_expression(query):
+    """Turn free text into an FTS5 expression that requires every word, treating each word literally."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def _language(language):
+    language = (language or 'all').strip().lower()
+    return None if language == 'all' else language
+
+
+def _reviewed_since(claims, since):
+    dates = pd.to_datetime(pd.Series([claim.get('Review Publication Date') for claim in claims], dtype=object),
+                           errors='coerce', utc=True)
+    return bool((dates >= since).any())
+
+
+class Corpus(SQLiteStore):
+    schema = _SCHEMA
+
+    def __init__(self, path=DEFAULT_PATH):
+        super().__init__(path)
+
+    def add_claims(self, claims, language=None):
+        """Upsert claims (``FactCheckLib.extract_info`` dicts); returns how many were new to the corpus."""
+        now = time.time()
+        dates = pd.to_datetime(pd.Series([claim.get('Review Publication Date') for claim in claims], dtype=object),
+                               errors='coerce', utc=True)
+        review_ts = (dates.values.view('int64') / 1e9).tolist()
+        rows = []
+        for claim, missing, ts in zip(claims, dates.isna().values, review_ts):
+            tags = claim.get('Tags')
+            rows.append((
+                claim_url(claim), claim.get('Claim'), claim.get('Source Name'), claim.get('Source URL'),
+                claim.get('Verdict'), claim.get('Review Publication Date'), None if missing else ts,
+                claim.get('Image URL'), json.dumps(tags if isinstance(tags, list) else [], ensure_ascii=False),
+            ))
+        with self._connect() as conn:
+            # Take the write lock up front: a read transaction that later upgrades to a write fails at once under WAL
+            # when another worker committed in between, instead of waiting for the busy timeout.
+            conn.execute('BEGIN IMMEDIATE')
+            # Stage the batch, then insert and touch it with one set-based statement each.
+            conn.execute('CREATE TEMP TABLE incoming (url TEXT, claim TEXT, source_name TEXT, source_url TEXT, '
+                         'verdict TEXT, review_date TEXT, review_ts REAL, image_url TEXT, tags TEXT)')
+            conn.executemany('INSERT INTO incoming VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            # ``rowcount`` counts rows inserted into ``claims`` only, not the FTS rows written by the trigger.
+            added = conn.execute(
+                'INSERT INTO claims (url, claim, source_name, source_url, verdict, review_date, review_ts, image_url, '
+                'tags, language, first_seen, last_seen) '
+                'SELECT url, claim, source_name, source_url, verdict, review_date, review_ts, image_url, tags, ?, ?, ? '
+                'FROM incoming WHERE true ON CONFLICT (url) DO NOTHING', (_language(language), now, now)).rowcount
+            conn.execute('UPDATE claims SET last_seen = ?, language = COALESCE(language, ?) '
+                         'WHERE first_seen < ? AND url IN (SELECT url FROM incoming)', (now, _language(language), now))
+            conn.execute('DROP TABLE incoming')
+        return added
+
+    def record_fetch(self, query, language):
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO fetches VALUES (?, ?, ?)',
+                         (query.strip().lower(), _language(language) or 'all', time.time()))
+
+    def last_fetch(self, query, language):
+        with self._connect() as conn:
+            row = conn.execute('SELECT fetched FROM fetches WHERE query = ? AND language = ?',
+                               (query.strip().lower(), _language(language) or 'all')).fetchone()
+        return row[0] if row else None
+
+    def search(self, query, language=None, since=None, until=None, limit=100):
+        """Return up to ``limit`` matching claims, best match first, as ``FactCheckLib.extract_info`` dicts.
+
+        ``since`` and ``until`` bound the review publication date (anything ``pd.Timestamp`` accepts).
+        """
+        expression = match_expression(query or '')
+        if not expression:
+            return []
+        sql = ['SELECT c.claim, c.source_name, c.source_url, c.verdict, c.review_date, c.image_url, c.tags '
+               'FROM claims_fts JOIN claims c ON c.id = claims_fts.rowid WHERE claims_fts MATCH ?']
+        params = [expression]
+        if _language(language):
+            sql.append('AND c.language = ?')
+            params.append(_language(language))
+        if since:
+            sql.append('AND c.review_ts >= ?')
+            params.append(pd.Timestamp(since).timestamp())
+        if until:
+            sql.append('AND c.review_ts < ?')
+            params.append((pd.Timestamp(until) + pd.Timedelta(days=1)).timestamp())
+        sql.append('ORDER BY bm25(claims_fts), c.review_ts DESC LIMIT ?')
+        params.append(int(limit or 100))
+        with self._connect() as conn:
+            rows = conn.execute(' '.join(sql), params).fetchall()
+        return [{
+            'Claim': claim, 'Source Name': source_name, 'Source URL': source_url, 'Verdict': verdict,
+            'Review Publication Date': review_date, 'Image URL': image_url, 'Tags': json.loads(tags),
+        } for claim, source_name, source_url, verdict, review_date, image_url, tags in rows]
+
+    def refresh(self, query, language, fetcher, max_results=10000, page_size=REFRESH_PAGE_SIZE, progress=None):
+        """Pull only the newest results of a search, page by page, and add them to the corpus.
+
+        Fetching stops at the first page that adds nothing new or, once the search was fetched before, holds no
+        review published since that fetch (less ``REFRESH_OVERLAP_DAYS``, for reviews indexed late). Both rules
+        assume the API lists the most recent reviews first: it takes no ordering parameter, so none is sent.
+        ``fetcher`` is a ``feat.fetch.PagedFetcher``. Returns the number of claims added.
+        """
+        last_fetch = self.last_fetch(query, language)
+        since = None
+        if last_fetch is not None:
+            since = pd.Timestamp(last_fetch, unit='s', tz='UTC') - pd.Timedelta(days=REFRESH_OVERLAP_DAYS)
+        added = 0
+        for i, page in enumerate(fetcher.iter_pages(query, language, max_results, page_size=page_size), start=1):
+            new = self.add_claims(page, language)
+            added += new
+            if progress is not None:
+                progress(i, max(1, -(-max_results // page_size)))
+            if new == 0 or since is not None and not _reviewed_since(page, since):
+                break
+        self.record_fetch(query, language)
+        return added
+
+    def stats(self):
+        with self._connect() as conn:
+            claims, oldest, newest = conn.execute(
+                'SELECT COUNT(*), MIN(review_date), MAX(review_date) FROM claims').fetchone()
+        return {'claims': claims, 'oldest_review': oldest, 'newest_review': newest}
@@ -0,0 +1,202 @@
+"""Streaming export of stored search results.
+
+``GET /export/<key>.<format>`` serves the stored result as FactCheckLib returned it (raw verdicts, tag lists, no
+derived columns) as ``csv``, ``csv.gz``, ``parquet`` or ``ndjson``. The first request serializes the rows chunk by
+chunk, streaming each chunk to the client while also writing it to an export file; later requests for the same
+result and format, including HTTP range and conditional requests, are served from that file. The worker never holds
+a full serialized copy in memory.
+"""
+import json
+import os
+import re
+import uuid
+import zlib
+
+from functools import lru_cache
+
+from flask import Response, abort, request, send_file
+
+from feat.lazy import lazy_import
+from feat.metrics import stage
+from feat.schema import SCALAR_COLUMNS, TAGS_COLUMN
+from feat.storage import evict_lru
+
+pa = lazy_import('pyarrow')
+pq = lazy_import('pyarrow.parquet')
+
+# Absolute, because send_file resolves relative paths against the app's root path rather than the working directory.
+EXPORT_DIR = os.path.abspath(os.environ.get('FEAT_EXPORT_DIR', os.path.join('.feat_cache', 'exports')))
+EXPORT_MAX_BYTES = int(os.environ.get('FEAT_EXPORT_MAX_BYTES', 2 * 1024 * 1024 * 1024))
+CHUNK_ROWS = int(os.environ.get('FEAT_EXPORT_CHUNK_ROWS', 10000))
+
+FORMATS = {
+    'csv': 'text/csv',
+    'csv.gz': 'application/gzip',
+    'parquet': 'application/vnd.apache.parquet',
+    'ndjson': 'application/x-ndjson',
+}
+
+@lru_cache(maxsize=None)
+def parquet_schema():
+    return pa.schema([
+        ('Claim', pa.string()),
+        ('Source Name', pa.string()),
+        ('Source URL', pa.string()),
+        ('Verdict', pa.string()),
+        ('Review Publication Date', pa.timestamp('ns')),
+        ('Image URL', pa.string()),
+        (TAGS_COLUMN, pa.list_(pa.string())),
+    ])
+
+
+def _frames(result, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(result), chunk_rows):
+        yield result.to_source_frame(positions=result.frame.index[start:start + chunk_rows])
+
+
+def _csv_chunks(result):
+    for i, frame in enumerate(_frames(result)):
+        frame[TAGS_COLUMN] = [json.dumps(tags, ensure_ascii=False) for tags in frame[TAGS_COLUMN]]
+        yield frame.to_csv(index=False, header=i == 0).encode('utf-8')
+    if not len(result):
+        yield (','.join(SCALAR_COLUMNS + [TAGS_COLUMN]) + '\n').encode('utf-8')
+
+
+def _gzip_chunks(result):
+    # wbits=31 writes a gzip container; zlib leaves the header mtime at 0, so output is byte-for-byte stable.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in _csv_chunks(result):
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _ndjson_chunks(result):
+    for frame in _frames(result):
+        chunk = frame.to_json(orient='records', lines=True, date_format='iso', force_ascii=False).encode('utf-8')
+        # pandas ends ``lines=True`` output with a newline from 1.5 on; older versions leave it off.
+        yield chunk if chunk.endswith(b'\n') else chunk + b'\n'
+
+
+class _ChunkSink:
+    """Write-only file object that hands whatever ParquetWriter wrote back to the caller."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def _parquet_chunks(result):
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, parquet_schema())
+    for frame in _frames(result):
+        writer.write_table(pa.Table.from_pandas(frame, schema=parquet_schema(), preserve_index=False))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+SERIALIZERS = {
+    'csv': _csv_chunks,
+    'csv.gz': _gzip_chunks,
+    'parquet': _parquet_chunks,
+    'ndjson': _ndjson_chunks,
+}
+
+
+def _tee(chunks, path, rows=None):
+    """Yield ``chunks`` while writing them to ``path``; the file only appears once every chunk was written."""
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f, stage('export', rows=rows, nbytes=0) as span:
+            for chunk in chunks:
+                f.write(chunk)
+                span.nbytes += len(chunk)
+                yield chunk
+        os.replace(tmp_path, path)
+        _evict_exports()
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _evict_exports():
+    entries = []
+    for entry in os.scandir(EXPORT_DIR):
+        if not entry.name.endswith('.tmp'):
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+    evict_lru(entries, EXPORT_MAX_BYTES, _remove)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _download_name(filename, fmt):
+    stem = re.sub(r'[^\w.-]+', '_', os.path.splitext(filename or '')[0]) or 'feat_results'
+    return f'{stem}.{fmt}'
+
+
+def register_export_routes(server, store, digest):
+    """Add the ``/export/<key>.<format>`` route to the Flask ``server``.
+
+    ``store`` is the ``ResultStore`` holding the results and ``digest`` computes a result's content hash, which
+    names the export files and serves as their ETag.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+
+    @server.route('/export/<name>')
+    def export_result(name):
+        key, _, fmt = name.partition('.')
+        if fmt not in SERIALIZERS:
+            abort(404)
+        result = store.get(key)
+        if result is None:
+            abort(404)
+        etag = f'{digest(result)}-{fmt.replace(".", "-")}'
+        path = os.path.join(EXPORT_DIR, f'{etag}.{fmt}')
+        download_name = _download_name(request.args.get('filename'), fmt)
+
+        if not os.path.exists(path) and request.range is not None:
+            # A byte range needs the complete file, so finish serializing it before answering.
+            for _ in _tee(SERIALIZERS[fmt](result), path, rows=len(result)):
+                pass
+        if os.path.exists(path):
+            return send_file(path, mimetype=FORMATS[fmt], as_attachment=True, download_name=download_name,
+                             conditional=True, etag=etag)
+
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+        response = Response(_tee(SERIALIZERS[fmt](result), path, rows=len(result)), mimetype=FORMATS[fmt])
+        response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+        response.headers['ETag'] = f'"{etag}"'
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+    return export_result
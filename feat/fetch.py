@@ -0,0 +1,118 @@
+"""Concurrent, paginated fetching of large searches.
+
+A search for more results than one page holds is split into ``offset``/``num_results`` pages that are fetched in
+parallel over one pooled ``requests.Session``, with retries and exponential backoff on connection errors and
+retryable HTTP statuses, a per-host concurrency limit, and de-duplication of results that appear on several pages.
+Responses are parsed with FactCheckLib's own parser.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from feat.lazy import lazy_import
+
+requests = lazy_import('requests')
+retry = lazy_import('urllib3.util.retry')
+factcheckexplorer = lazy_import('factcheckexplorer.factcheckexplorer')
+
+SEARCH_URL = 'https://toolbox.google.com/factcheck/api/search'
+PAGE_SIZE = int(os.environ.get('FEAT_FETCH_PAGE_SIZE', 1000))
+MAX_WORKERS = int(os.environ.get('FEAT_FETCH_CONCURRENCY', 4))
+PER_HOST_LIMIT = int(os.environ.get('FEAT_FETCH_PER_HOST', 4))
+RETRIES = int(os.environ.get('FEAT_FETCH_RETRIES', 3))
+BACKOFF = float(os.environ.get('FEAT_FETCH_BACKOFF', 0.5))
+TIMEOUT = float(os.environ.get('FEAT_FETCH_TIMEOUT', 60))
+
+
+def claim_identity(claim):
+    return claim.get('Source URL') or (claim.get('Source Name'), claim.get('Claim'))
+
+
+def dedupe_claims(claims):
+    seen = set()
+    unique = []
+    for claim in claims:
+        identity = claim_identity(claim)
+        if identity not in seen:
+            seen.add(identity)
+            unique.append(claim)
+    return unique
+
+
+class PagedFetcher:
+    def __init__(self, url=None, page_size=PAGE_SIZE, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT,
+                 retries=RETRIES, backoff=BACKOFF, timeout=TIMEOUT):
+        self.url = url
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_workers, pool_maxsize=max(max_workers, per_host_limit),
+            max_retries=retry.Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                                    allowed_methods=frozenset(['GET'])))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def fetch_page(self, fact_check_lib, offset, num_results):
+        url = self.url or getattr(fact_check_lib, 'url', SEARCH_URL)
+        params = dict(getattr(fact_check_lib, 'params', {}) or {})
+        params.update({'query': fact_check_lib.query, 'offset': str(offset), 'num_results': str(num_results)})
+        with self._host_limit(url):
+            response = self.session.get(url, params=params, headers=getattr(fact_check_lib, 'headers', None),
+                                        timeout=self.timeout)
+        response.raise_for_status()
+        return fact_check_lib.extract_info(fact_check_lib.clean_json(response.text)) or []
+
+    def fetch(self, query, language=None, num_results=100, progress=None):
+        """Fetch up to ``num_results`` claims in concurrent pages; ``progress(done, total)`` is called per page."""
+        num_results = num_results or 100
+        fact_check_lib = factcheckexplorer.FactCheckLib(query=query, language=language or 'all',
+                                                        num_results=self.page_size)
+        offsets = list(range(0, num_results, self.page_size))
+        pages = [None] * len(offsets)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch_page, fact_check_lib, offset,
+                                       min(self.page_size, num_results - offset)): i
+                       for i, offset in enumerate(offsets)}
+            for future in as_completed(futures):
+                pages[futures[future]] = future.result()
+                done += 1
+                if progress is not None:
+                    progress(done, len(offsets))
+        return dedupe_claims(claim for page in pages for claim in page)[:num_results]
+
+    def iter_pages(self, query, language=None, num_results=100, page_size=None):
+        """Yield the pages of a search one at a time, in offset order, stopping after a short page."""
+        num_results = num_results or 100
+        page_size = page_size or self.page_size
+        fact_check_lib = factcheckexplorer.FactCheckLib(query=query, language=language or 'all', num_results=page_size)
+        for offset in range(0, num_results, page_size):
+            page = self.fetch_page(fact_check_lib, offset, min(page_size, num_results - offset))
+            yield page
+            if len(page) < page_size:
+                return
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def default_fetcher():
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = PagedFetcher()
+        return _default_fetcher
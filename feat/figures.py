@@ -0,0 +1,150 @@
+"""Plotly figure builders for the analytics charts, with a small memo keyed on the result set.
+
+Builders take a ``feat.schema.ResultSet``.
+"""
+import threading
+from collections import Counter, OrderedDict
+
+from feat.lazy import lazy_import
+from feat.metrics import stage
+from feat.timeline import DATE_COLUMN, VERDICT_COLUMN, comparison_counts, timeline_counts
+
+np = lazy_import('numpy')
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+
+
+def placeholder_figure(title):
+    return px.scatter(title=title)
+
+
+def verdict_figure(result):
+    verdict_fig = px.pie(result.frame, names='Verdict Grouped', title='Verdict Distribution')
+    verdict_fig.update_traces(textinfo='percent+label')
+    return verdict_fig
+
+
+def tags_figure(result):
+    tags_fig = px.bar(result.tags.counts().reset_index(), x='index', y='Tags',
+                      title='Tags Volume', labels={'index': 'Tag', 'Tags': 'Count'})
+    tags_fig.update_layout(xaxis_title="Tag", yaxis_title="Count")
+    return tags_fig
+
+
+def timeline_figure(result, mode='bars'):
+    """Claims over time: stacked per-verdict counts per time bucket as ``bars`` or ``area``, or every claim as a
+    WebGL marker (``points``)."""
+    colors = px.colors.qualitative.Plotly
+    timeline_fig = go.Figure()
+    timeline_fig.update_xaxes(type='date')
+    if mode == 'points':
+        frame = result.frame[[DATE_COLUMN, VERDICT_COLUMN]].dropna()
+        # Pre-formatted dates and numpy arrays serialize several times faster than plotly's per-value encoding.
+        dates = frame[DATE_COLUMN].values
+        unit = 'D' if (dates.astype('datetime64[D]') == dates).all() else 's'
+        frame = frame.assign(**{DATE_COLUMN: np.datetime_as_string(dates, unit=unit)})
+        groups = frame.groupby(VERDICT_COLUMN, observed=True)[DATE_COLUMN]
+        for i, (verdict, dates) in enumerate(sorted(groups, key=lambda group: -len(group[1]))):
+            timeline_fig.add_trace(go.Scattergl(x=dates.values, y=np.full(len(dates), str(verdict), dtype=object),
+                                                mode='markers', name=str(verdict),
+                                                marker_color=colors[i % len(colors)]))
+        timeline_fig.update_layout(title='Timeline of Claims', xaxis_title="Date", yaxis_title="Verdict")
+        return timeline_fig
+
+    counts, bucket = timeline_counts(result)
+    for i, verdict in enumerate(counts.columns):
+        color = colors[i % len(colors)]
+        if mode == 'area':
+            timeline_fig.add_trace(go.Scatter(x=counts.index, y=counts[verdict], name=str(verdict), mode='lines',
+                                              stackgroup='verdicts', line_color=color))
+        else:
+            timeline_fig.add_trace(go.Bar(x=counts.index, y=counts[verdict], name=str(verdict), marker_color=color))
+    timeline_fig.update_layout(title=f'Timeline of Claims (per {bucket})', xaxis_title="Date",
+                               yaxis_title="Claims", barmode='stack', bargap=0.1)
+    return timeline_fig
+
+
+def sources_figure(result):
+    sources_counts = result.frame['Source Name'].value_counts().reset_index()
+    sources_fig = px.bar(sources_counts, x='Source Name', y='index', orientation='h',
+                         labels={'index': 'Source', 'Source Name': 'Number of Checks'},
+                         title='Source Volume', text_auto='.2s')
+    sources_fig.update_layout(xaxis_title="Number of Checks", yaxis_title="Source",
+                              font=dict(family="Roboto, sans-serif", size=12, color="#333"))
+    return sources_fig
+
+
+def compare_verdicts_figure(comparison):
+    """Verdict mix of each compared query as one 100% stacked bar per query; rare verdicts are folded together."""
+    labels = comparison.labels()
+    total = sum(comparison.verdicts.values())
+    # Same rule as ``group_small_verdicts``, applied to the verdicts of all queries together.
+    small = {verdict for verdict, count in comparison.verdicts.items() if count * 100 < 2 * total}
+    grouped = []
+    for aggregates in comparison.queries.values():
+        counts = Counter()
+        for verdict, count in aggregates.verdicts.items():
+            counts['other' if verdict in small else verdict] += count
+        grouped.append(counts)
+    order = Counter()
+    for counts in grouped:
+        order.update(counts)
+    totals = np.array([max(sum(counts.values()), 1) for counts in grouped])
+    colors = px.colors.qualitative.Plotly
+    verdicts_fig = go.Figure()
+    for i, (verdict, _) in enumerate(order.most_common()):
+        counts = np.array([query_counts[verdict] for query_counts in grouped])
+        verdicts_fig.add_trace(go.Bar(y=labels, x=counts * 100 / totals, customdata=counts, name=str(verdict),
+                                      orientation='h', marker_color=colors[i % len(colors)],
+                                      hovertemplate='%{y}: %{customdata} claims (%{x:.1f}%)'))
+    verdicts_fig.update_layout(title='Verdict Distribution by Query', barmode='stack',
+                               xaxis_title="Share of Claims (%)", yaxis_title="Query", yaxis_autorange='reversed')
+    return verdicts_fig
+
+
+def compare_sources_figure(comparison, top=20):
+    """Claims of the ``top`` sources across the compared queries, one heatmap column per query."""
+    sources = [source for source, _ in comparison.sources.most_common(top)]
+    counts = [[aggregates.sources.get(source, 0) for aggregates in comparison.queries.values()]
+              for source in sources]
+    sources_fig = go.Figure(go.Heatmap(z=counts, x=comparison.labels(), y=sources, colorscale='Blues',
+                                       texttemplate='%{z}', hovertemplate='%{y} in %{x}: %{z} claims<extra></extra>'))
+    sources_fig.update_layout(title=f'Source Overlap ({comparison.shared_sources} of {len(comparison.sources)} '
+                                    f'sources in more than one query)',
+                              xaxis_title="Query", yaxis_title="Source", yaxis_autorange='reversed')
+    return sources_fig
+
+
+def compare_timeline_figure(comparison):
+    """Claims over time of each compared query, counted per day, week or month like ``timeline_figure``."""
+    counts, bucket = comparison_counts(comparison)
+    timeline_fig = go.Figure()
+    timeline_fig.update_xaxes(type='date')
+    for label in counts.columns:
+        timeline_fig.add_trace(go.Scatter(x=counts.index, y=counts[label], name=str(label), mode='lines'))
+    timeline_fig.update_layout(title=f'Claims over Time by Query (per {bucket})', xaxis_title="Date",
+                               yaxis_title="Claims")
+    return timeline_fig
+
+
+class FigureMemo:
+    """Bounded LRU memo of built figures, keyed on ``(builder name, result digest, parameters)``."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, digest, builder, result, **params):
+        key = (builder.__name__, digest, tuple(sorted(params.items())))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        with stage(builder.__name__, rows=len(result)):
+            figure = builder(result, **params)
+        with self._lock:
+            self._entries[key] = figure
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
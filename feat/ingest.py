@@ -0,0 +1,66 @@
+"""Build typed result sets straight from FactCheckLib, with no CSV round-trip."""
+import ast
+
+from feat.fetch import PAGE_SIZE, default_fetcher
+from feat.lazy import lazy_import
+from feat.metrics import stage
+from feat.schema import SCALAR_COLUMNS, TAGS_COLUMN, ResultSet
+
+factcheckexplorer = lazy_import('factcheckexplorer.factcheckexplorer')
+
+COLUMNS = SCALAR_COLUMNS + [TAGS_COLUMN]
+
+
+def fetch_claims(query, language=None, num_results=100, progress=None):
+    """Run the FactCheckLib fetch/parse steps and return the parsed claims as a list of dicts.
+
+    Searches larger than one page are fetched concurrently in pages, see ``feat.fetch``.
+    """
+    if (num_results or 100) > PAGE_SIZE:
+        return default_fetcher().fetch(query, language, num_results, progress=progress)
+    fact_check_lib = factcheckexplorer.FactCheckLib(query=query, language=language or 'all',
+                                                    num_results=num_results or 100)
+    raw_json = fact_check_lib.fetch_data()
+    if not raw_json:
+        raise ConnectionError(f"No response from Fact Check Explorer for query {query!r}")
+    return fact_check_lib.extract_info(fact_check_lib.clean_json(raw_json)) or []
+
+
+def _as_tag_list(tags):
+    if isinstance(tags, list):
+        return tags
+    if isinstance(tags, str):
+        if tags.startswith('['):
+            return list(ast.literal_eval(tags))
+        return [tag.strip() for tag in tags.split(',') if tag.strip()]
+    return []
+
+
+def result_from_claims(claims):
+    """Build a compact ``ResultSet`` from parsed claims, see ``feat.schema``."""
+    return ResultSet.from_records(claims, [_as_tag_list(claim.get(TAGS_COLUMN)) for claim in claims])
+
+
+def fetch_results(query, language=None, num_results=100, cache=None, corpus=None, progress=None):
+    """Fetch a search as a ``ResultSet``, going through ``cache`` (a ``ResultCache``) when one is given.
+
+    Freshly fetched claims are also added to ``corpus`` (a ``feat.corpus.Corpus``) when one is given.
+    ``progress(done, total)`` is called as the pages of a large search arrive.
+    """
+    claims = None
+    if cache is not None:
+        with stage('cache_lookup') as span:
+            claims = cache.get(query, language, num_results)
+            span.rows = len(claims) if claims is not None else 0
+    if claims is None:
+        with stage('fetch') as span:
+            claims = fetch_claims(query, language, num_results, progress=progress)
+            span.rows = len(claims)
+        if cache is not None:
+            cache.put(query, language, num_results, claims)
+        if corpus is not None:
+            with stage('corpus_add', rows=len(claims)):
+                corpus.add_claims(claims, language)
+                corpus.record_fetch(query, language)
+    with stage('parse', rows=len(claims)):
+        return result_from_claims(claims)
@@ -0,0 +1,75 @@
+"""Background job support for long searches.
+
+Searches run as Dash background callbacks on a local diskcache-backed manager, so no Redis or Celery is needed.
+The same cache holds a fixed number of fetch slots that bound how many remote fetches run at once across all
+workers and jobs.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+import diskcache
+import psutil
+from dash import DiskcacheManager
+
+DEFAULT_JOBS_DIR = os.environ.get('FEAT_JOBS_DIR', os.path.join('.feat_cache', 'jobs'))
+MAX_CONCURRENT_FETCHES = int(os.environ.get('FEAT_MAX_CONCURRENT_FETCHES', 4))
+FETCH_LEASE_SECONDS = int(os.environ.get('FEAT_FETCH_LEASE_SECONDS', 300))
+
+jobs_cache = diskcache.Cache(DEFAULT_JOBS_DIR)
+
+
+def background_manager():
+    return DiskcacheManager(jobs_cache)
+
+
+def _holder_alive(pid):
+    # A killed job that was not reaped yet lingers as a zombie; it will never release its slot either.
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+    except psutil.AccessDenied:
+        return True
+
+
+def _take_over_dead_slot(slots, lease):
+    """Claim a slot whose holder died without releasing it; return its key, or ``None``."""
+    for slot in range(slots):
+        key = f'fetch-slot-{slot}'
+        pid = jobs_cache.get(key)
+        if pid is None or _holder_alive(pid):
+            continue
+        with jobs_cache.transact():
+            if jobs_cache.get(key) == pid:
+                jobs_cache.set(key, os.getpid(), expire=lease)
+                return key
+    return None
+
+
+@contextmanager
+def fetch_slot(on_wait=None, slots=MAX_CONCURRENT_FETCHES, lease=FETCH_LEASE_SECONDS, poll_interval=0.25):
+    """Hold one of ``slots`` fetch slots for the duration of the block.
+
+    Each slot records the process holding it. A job cancelled by the user is killed without running its cleanup,
+    so when no slot is free, slots held by processes that no longer exist are taken over; slots are also leases that
+    expire after ``lease`` seconds as a last resort. ``on_wait`` is called once if the block has to queue for a slot.
+    """
+    waited = False
+    while True:
+        key = None
+        for slot in range(slots):
+            if jobs_cache.add(f'fetch-slot-{slot}', os.getpid(), expire=lease):
+                key = f'fetch-slot-{slot}'
+                break
+        key = key or _take_over_dead_slot(slots, lease)
+        if key is not None:
+            try:
+                yield
+            finally:
+                jobs_cache.delete(key)
+            return
+        if not waited and on_wait is not None:
+            on_wait()
+        waited = True
+        time.sleep(poll_interval)
@@ -0,0 +1,88 @@
+"""Deferred imports of the heavy dependencies, so a worker starts serving before pandas, plotly and pyarrow load.
+
+``lazy_import(name)`` returns a stand-in module that imports the real one on first attribute access. With
+``FEAT_LAZY_IMPORTS=0`` it imports eagerly instead. ``warm_up()`` loads everything a search needs and runs a tiny
+synthetic result set through the figure builders, so the first real search does not pay for it; by default it runs
+in a background thread once the app is set up, and any fork of the process waits for it to finish.
+"""
+import importlib
+import os
+import threading
+import time
+import types
+
+LAZY_IMPORTS = os.environ.get('FEAT_LAZY_IMPORTS', '1').lower() not in ('0', 'false', 'no')
+WARMUP = os.environ.get('FEAT_WARMUP', 'background').lower()
+
+HEAVY_MODULES = ['numpy', 'pandas', 'plotly.express', 'plotly.graph_objects', 'pyarrow', 'pyarrow.parquet',
+                 'requests', 'factcheckexplorer.factcheckexplorer']
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first attribute access.
+
+    The import itself goes through ``importlib``, whose per-module locks make concurrent first uses safe; afterwards
+    the real module's attributes are copied in, so later lookups never reach ``__getattr__``.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        with self._lock:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """Return module ``name``, deferring the import to first use when lazy imports are on."""
+    if not LAZY_IMPORTS:
+        return importlib.import_module(name)
+    return LazyModule(name)
+
+
+def warm_up():
+    """Load the heavy modules and build every figure once on a tiny result set; returns the seconds it took."""
+    started = time.perf_counter()
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+    from feat.figures import sources_figure, tags_figure, timeline_figure, verdict_figure
+    from feat.ingest import result_from_claims
+    from feat.network import build_network
+    from feat.verdicts import default_normalizer, group_small_verdicts
+
+    result = result_from_claims([
+        {'Claim': 'warm-up', 'Source Name': 'FEAT', 'Source URL': f'https://example.org/{i}', 'Verdict': verdict,
+         'Review Publication Date': date, 'Image URL': None, 'Tags': ['warm-up']}
+        for i, (verdict, date) in enumerate([('False', '2024-01-01'), ('True', '2024-02-01')])
+    ])
+    result.frame['Verdict'] = default_normalizer.normalize(result.frame['Verdict'])
+    result.frame['Verdict Grouped'] = group_small_verdicts(result.frame['Verdict'])
+    for builder in (verdict_figure, tags_figure, timeline_figure, sources_figure):
+        builder(result).to_json()
+    build_network(result)
+    return time.perf_counter() - started
+
+
+def start_warm_up(mode=WARMUP):
+    """Run ``warm_up`` as configured by ``FEAT_WARMUP``: ``background`` (a daemon thread), ``eager`` or ``off``."""
+    if mode == 'off':
+        return None
+    if mode == 'eager':
+        warm_up()
+        return None
+
+    def run():
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"Error warming up: {e}")
+
+    thread = threading.Thread(target=run, name='feat-warm-up', daemon=True)
+    thread.start()
+    # A fork while the thread holds an import lock would leave the child (a background callback job, a preforked
+    # worker) deadlocked on its first import, so forks wait for the warm-up to finish instead.
+    os.register_at_fork(before=lambda: thread.join() if thread is not threading.current_thread() else None)
+    return thread
@@ -0,0 +1,32 @@
+"""The verdict replacement chain ``update_charts`` applied before ``feat.verdicts``.
+
+Kept as the reference that the verdict tests pin the normalizer's output against and that
+``benchmarks.bench_verdicts`` times the normalizer against; nothing in the app uses it.
+"""
+
+# In its original order; later entries rewrite the output of earlier ones.
+LEGACY_REPLACEMENTS = [
+    ("falso", "false"), ("fake", "false"), ("falsa", "false"), ("verdadero", "true"), ("c'est faux", "false"),
+    ("doğru", "true"), ("dogru", "true"), ("doğruluk payı vardır", "half true"), ("errado", "false"),
+    ("মিথ্যা", "false"), ("অসত্য", "false"), ("fals", "false"), ("falsch", "false"), ("false content/false", "false"),
+    ("false context/false", "false"), ("falso!", "false"), ("faux", "false"), ("mostly true", "half true"),
+    ("partialmente falso", "mostly false"), ("misleading/partly false", "mostly false"), ("Çok YanlÄ±ÅŞ", "false"),
+    ("incorrect", "false"), ("مضلل", "false"), ("نادرست", "false"), ("زائف", "false"), ("錯誤", "false"),
+    ("部分錯誤", "false"), ("pants on fire", "false"), ("four pinocchios", "false"),
+    ("three pinocchios", "mostly false"), ("falsee", "false"), ("неверно", "false"), ("правильно", "true"),
+    ("помилковий", "false"), ("вірно", "true"), ("錯誤的", "false"), ("正確的", "true"), ("錯誤な", "false"),
+    ("正しい", "true"), ("incorrecto", "false"), ("notizia false", "false"), ("c'eri quasi", "half true"),
+    ("pinocchio andante", "false"), ("notizia vera", "true"), ("vera", "true"), ("vero", "true"), ("cierto", "true"),
+    ("engañoso", "mostly false"), ("es falso", "false"), ("scam", "false"), ("enganoso", "false"),
+    ("falsz", "false"), ("falsekt", "false"), ("falsekt", "false"), ("misleidend", "misleading"),
+    ("trompeur", "false"), ("yanlış", "false"), ("es false", "false"), ("correct attribution", "true"),
+    ("correct", "true"), ("delimično netačno", "mostly false"), ("enganador", "mostly false"),
+    ("epätosi", "false"), ("fałsz", "false"),
+]
+
+
+def legacy_normalize(verdicts):
+    verdicts = verdicts.apply(lambda text: text.rstrip('.').lower())
+    for old, new in LEGACY_REPLACEMENTS:
+        verdicts = verdicts.str.replace(old, new, regex=False)
+    return verdicts
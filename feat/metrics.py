@@ -0,0 +1,264 @@
+"""Hot-path instrumentation: per-stage timings, rows and bytes, served in Prometheus text format.
+
+``stage(name)`` times one step of the search pipeline. Stages that run inside a ``Trace`` (one per HTTP request or
+background job) are written together when the trace finishes, in one transaction; with ``FEAT_REQUEST_LOG`` set,
+each trace is also logged as one JSON line. Totals live in a SQLite file, so the ``/metrics`` route of any worker
+reports the totals of all workers and background jobs.
+"""
+import contextvars
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from flask import Response, request
+
+from feat.storage import SQLiteStore
+
+DEFAULT_PATH = os.environ.get('FEAT_METRICS_PATH', os.path.join('.feat_cache', 'metrics.sqlite3'))
+ENABLED = os.environ.get('FEAT_METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+REQUEST_LOG = os.environ.get('FEAT_REQUEST_LOG', '').lower() in ('1', 'true', 'yes')
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# name: (type, help); histograms are stored as their _bucket, _sum and _count series.
+FAMILIES = {
+    'feat_stage_seconds': ('histogram', "Time spent in each pipeline stage."),
+    'feat_stage_rows_total': ('counter', "Rows processed by each pipeline stage."),
+    'feat_stage_bytes_total': ('counter', "Bytes produced by each pipeline stage."),
+    'feat_stage_errors_total': ('counter', "Pipeline stages that raised."),
+    'feat_http_request_seconds': ('histogram', "Time to answer HTTP requests, per route or Dash callback."),
+    'feat_http_requests_total': ('counter', "HTTP requests, per route or Dash callback and status."),
+    'feat_http_response_bytes_total': ('counter', "Response payload bytes, per route or Dash callback."),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    metric TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    le TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (metric, labels, le)
+);
+"""
+
+logger = logging.getLogger('feat.requests')
+_current_trace = contextvars.ContextVar('feat_trace', default=None)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    """Sample value in exposition format: integers exactly, floats at full precision."""
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _histogram(name, labels, seconds):
+    updates = [(f'{name}_bucket', labels, f'{bound:g}', 1) for bound in BUCKETS if seconds <= bound]
+    updates.append((f'{name}_bucket', labels, '+Inf', 1))
+    updates.append((f'{name}_sum', labels, '', seconds))
+    updates.append((f'{name}_count', labels, '', 1))
+    return updates
+
+
+class Metrics(SQLiteStore):
+    schema = _SCHEMA
+
+    def __init__(self, path=DEFAULT_PATH):
+        super().__init__(path)
+
+    def record(self, spans=(), route=None, status=None, seconds=None, nbytes=None):
+        """Add finished ``spans`` and, when ``route`` is given, one answered HTTP request to the totals."""
+        updates = []
+        for span in spans:
+            labels = f'stage="{_label(span.stage)}"'
+            updates += _histogram('feat_stage_seconds', labels, span.seconds)
+            updates.append(('feat_stage_rows_total', labels, '', span.rows or 0))
+            updates.append(('feat_stage_bytes_total', labels, '', span.nbytes or 0))
+            if span.error:
+                updates.append(('feat_stage_errors_total', labels, '', 1))
+        if route is not None:
+            labels = f'route="{_label(route)}"'
+            updates += _histogram('feat_http_request_seconds', labels, seconds)
+            updates.append(('feat_http_requests_total', f'{labels},status="{status}"', '', 1))
+            updates.append(('feat_http_response_bytes_total', labels, '', nbytes or 0))
+        if not updates or not ENABLED:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany('INSERT INTO samples VALUES (?, ?, ?, ?) ON CONFLICT (metric, labels, le) '
+                                 'DO UPDATE SET value = value + excluded.value', updates)
+        except sqlite3.Error as e:
+            # Instrumentation must never fail the request it measures.
+            print(f"Error recording metrics: {e}")
+
+    def render(self, gauges=()):
+        """Prometheus text exposition of the totals, plus ``gauges`` as ``(name, help, value)`` tuples."""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT metric, labels, le, value FROM samples').fetchall()
+        values = {(metric, labels, le): value for metric, labels, le, value in rows}
+        lines = []
+        for family, (kind, help_text) in FAMILIES.items():
+            if kind == 'histogram':
+                label_sets = sorted(labels for metric, labels, _ in values if metric == f'{family}_count')
+            else:
+                label_sets = sorted(labels for metric, labels, _ in values if metric == family)
+            if not label_sets:
+                continue
+            lines += [f'# HELP {family} {help_text}', f'# TYPE {family} {kind}']
+            for labels in label_sets:
+                if kind != 'histogram':
+                    lines.append(f'{family}{{{labels}}} {_number(values[family, labels, ""])}')
+                    continue
+                # Buckets are cumulative and only stored once hit, so a missing bucket is zero.
+                for le in [f'{bound:g}' for bound in BUCKETS] + ['+Inf']:
+                    count = values.get((f'{family}_bucket', labels, le), 0)
+                    lines.append(f'{family}_bucket{{{labels},le="{le}"}} {_number(count)}')
+                lines.append(f'{family}_sum{{{labels}}} {_number(values[f"{family}_sum", labels, ""])}')
+                lines.append(f'{family}_count{{{labels}}} {_number(values[f"{family}_count", labels, ""])}')
+        for name, help_text, value in gauges:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {_number(value)}']
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM samples')
+
+
+class Span:
+    __slots__ = ('stage', 'seconds', 'rows', 'nbytes', 'error')
+
+    def __init__(self, stage, rows=None, nbytes=None):
+        self.stage = stage
+        self.seconds = 0.0
+        self.rows = rows
+        self.nbytes = nbytes
+        self.error = False
+
+    def as_dict(self):
+        return {'stage': self.stage, 'seconds': round(self.seconds, 6), 'rows': self.rows, 'bytes': self.nbytes,
+                'error': self.error}
+
+
+class Trace:
+    """The stages of one request or job, recorded together when it finishes."""
+
+    def __init__(self, name, metrics=None, **fields):
+        self.name = name
+        self.metrics = metrics or default_metrics
+        self.fields = fields
+        self.spans = []
+        self.started = time.perf_counter()
+        self.finished = False
+
+    def finish(self, route=None, status=None, nbytes=None, **fields):
+        seconds = time.perf_counter() - self.started
+        self.finished = True
+        self.metrics.record(self.spans, route=route, status=status, seconds=seconds, nbytes=nbytes)
+        if REQUEST_LOG:
+            line = {'event': self.name, **self.fields, **fields, 'seconds': round(seconds, 6)}
+            if route is not None:
+                line.update(route=route, status=status, bytes=nbytes)
+            line['stages'] = [span.as_dict() for span in self.spans]
+            logger.info(json.dumps(line, ensure_ascii=False, default=str))
+        return seconds
+
+
+@contextmanager
+def stage(name, rows=None, nbytes=None):
+    """Time the block as pipeline stage ``name``; set ``rows``/``nbytes`` on the yielded span as they become known."""
+    span = Span(name, rows, nbytes)
+    started = time.perf_counter()
+    try:
+        yield span
+    except Exception:
+        span.error = True
+        raise
+    finally:
+        span.seconds = time.perf_counter() - started
+        trace = _current_trace.get()
+        if trace is not None and not trace.finished:
+            trace.spans.append(span)
+        else:
+            (trace.metrics if trace is not None else default_metrics).record([span])
+
+
+@contextmanager
+def traced(name, metrics=None, **fields):
+    """Run the block as a ``Trace`` (e.g. a background job), itself recorded as stage ``name``."""
+    trace = Trace(name, metrics, **fields)
+    token = _current_trace.set(trace)
+    span = Span(name)
+    try:
+        yield trace
+    except Exception:
+        span.error = True
+        raise
+    finally:
+        _current_trace.reset(token)
+        span.seconds = time.perf_counter() - trace.started
+        trace.spans.append(span)
+        trace.finish()
+
+
+def _route_label():
+    if request.path == '/_dash-update-component':
+        # One label per callback, named after its outputs.
+        body = request.get_json(silent=True) or {}
+        return f"callback:{body.get('output', '')}"
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def register_metrics_routes(server, metrics=None, gauges=None):
+    """Trace every request to the Flask ``server`` and add the ``/metrics`` route.
+
+    ``gauges`` is an optional callable returning extra ``(name, help, value)`` tuples, read on each scrape.
+    """
+    metrics = metrics or default_metrics
+    if REQUEST_LOG and not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+        logger.setLevel(logging.INFO)
+
+    @server.before_request
+    def start_request_trace():
+        if request.path != '/metrics':
+            request.environ['feat.trace'] = trace = Trace('request', metrics)
+            request.environ['feat.trace_token'] = _current_trace.set(trace)
+
+    @server.after_request
+    def finish_request_trace(response):
+        trace = request.environ.get('feat.trace')
+        if trace is not None and not trace.finished:
+            # Streamed responses have no length yet; their stages count the bytes they produce.
+            trace.finish(route=_route_label(), status=response.status_code, nbytes=response.content_length,
+                         method=request.method)
+        return response
+
+    @server.teardown_request
+    def reset_request_trace(exc):
+        token = request.environ.pop('feat.trace_token', None)
+        if token is not None:
+            try:
+                _current_trace.reset(token)
+            except ValueError:
+                # Reset from a different context, e.g. a streamed response that outlived the request.
+                pass
+
+    @server.route('/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(gauges() if gauges is not None else ()),
+                        mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return metrics_endpoint
+
+
+default_metrics = Metrics()
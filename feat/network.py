@@ -0,0 +1,71 @@
+"""Source–tag co-occurrence network for the cytoscape graph."""
+from feat.lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+
+def _node_degrees(edges):
+    return pd.concat([
+        edges['source'].value_counts().rename_axis('name').reset_index(name='degree').assign(kind='source'),
+        edges['target'].value_counts().rename_axis('name').reset_index(name='degree').assign(kind='tag'),
+    ], ignore_index=True)
+
+
+def prune_network(edges, top_k=None, min_weight=1, sources=None):
+    """Apply ``min_weight`` and ``top_k`` to a ``source``/``target``/``weight`` edge table; return ``(nodes, edges)``.
+
+    ``top_k`` keeps the ``top_k`` highest-degree sources, then the ``top_k`` highest-degree tags linked to them, so
+    at least one edge is left whenever there was one; values below 1 keep every node. ``sources``, when given, lists
+    every source, so that sources without tags still get a node if nothing is pruned.
+    """
+    top_k = int(top_k or 0)
+    min_weight = min_weight or 1
+    edges = edges[edges['weight'] >= min_weight]
+    nodes = _node_degrees(edges)
+
+    if top_k > 0:
+        # Sources and tags are ranked separately: on large searches the highest-degree nodes are all sources, and a
+        # joint ranking would keep no tag (and so no edge) at all.
+        tag_degrees = edges['target'].value_counts()
+        edges = edges[edges['source'].isin(edges['source'].value_counts().nlargest(top_k, keep='first').index)]
+        tag_degrees = tag_degrees[tag_degrees.index.isin(edges['target'])]
+        edges = edges[edges['target'].isin(tag_degrees.nlargest(top_k, keep='first').index)]
+        nodes = _node_degrees(edges)
+    elif min_weight <= 1 and sources is not None:
+        isolated = pd.Index(sources).difference(edges['source'])
+        nodes = pd.concat([nodes, pd.DataFrame({'name': isolated, 'degree': 0, 'kind': 'source'})],
+                          ignore_index=True)
+    return nodes, edges.reset_index(drop=True)
+
+
+def network_tables(result, top_k=None, min_weight=1):
+    """Return ``(nodes, edges)`` frames for the source–tag network of a ``ResultSet``.
+
+    ``edges`` has one row per (source, tag) pair with its co-occurrence count as ``weight``; ``nodes`` has one row
+    per node with its ``kind`` and ``degree``. Edges lighter than ``min_weight`` are dropped, and with ``top_k`` only
+    the ``top_k`` highest-degree sources and tags (and the edges between them) are kept, see ``prune_network``.
+    """
+    pairs = result.source_tag_pairs().dropna()
+    edges = (pairs.groupby(['Source Name', 'Tags'], observed=True).size()
+             .rename('weight').reset_index()
+             .rename(columns={'Source Name': 'source', 'Tags': 'target'}))
+    edges['source'] = edges['source'].astype(str)
+    edges['target'] = edges['target'].astype(str)
+    sources = None
+    if int(top_k or 0) < 1 and (min_weight or 1) <= 1:
+        sources = result.frame['Source Name'].dropna().astype(str).unique()
+    return prune_network(edges, top_k=top_k, min_weight=min_weight, sources=sources)
+
+
+def network_elements(nodes, edges):
+    """Cytoscape ``elements`` for ``(nodes, edges)`` frames as returned by ``network_tables``."""
+    elements = [{'data': {'id': f'{kind}:{name}', 'label': name, 'degree': int(degree)}, 'classes': kind}
+                for name, kind, degree in zip(nodes['name'], nodes['kind'], nodes['degree'])]
+    elements += [{'data': {'source': f'source:{source}', 'target': f'tag:{target}', 'weight': int(weight)}}
+                 for source, target, weight in zip(edges['source'], edges['target'], edges['weight'])]
+    return elements
+
+
+def build_network(result, top_k=None, min_weight=1):
+    """Build cytoscape ``elements`` for the source–tag network, see ``network_tables``."""
+    return network_elements(*network_tables(result, top_k=top_k, min_weight=min_weight))
@@ -0,0 +1,38 @@
+"""The fetch/normalize pipeline shared by interactive searches and batch runs."""
+from feat.fetch import default_fetcher
+from feat.ingest import fetch_results, result_from_claims
+from feat.metrics import stage
+from feat.verdicts import default_normalizer, group_small_verdicts
+
+SEARCH_MODES = ('remote', 'local', 'refresh')
+
+
+def search_results(query, language=None, num_results=100, cache=None, corpus=None, mode='remote', since=None,
+                   until=None, progress=None):
+    """Fetch a search and return its ``ResultSet`` with normalized and grouped verdicts.
+
+    ``mode`` is one of ``SEARCH_MODES``: ``remote`` fetches from Fact Check Explorer (through ``cache``, adding
+    to ``corpus``), ``local`` answers from ``corpus`` alone, and ``refresh`` first pulls the newest results into
+    ``corpus`` and then answers from it. ``since`` and ``until`` bound review dates in the corpus modes.
+    """
+    if mode == 'remote':
+        result = fetch_results(query, language, num_results, cache=cache, corpus=corpus, progress=progress)
+    elif mode in SEARCH_MODES:
+        if corpus is None:
+            raise ValueError(f"Search mode {mode!r} needs a local corpus")
+        if mode == 'refresh':
+            with stage('corpus_refresh') as span:
+                span.rows = corpus.refresh(query, language, default_fetcher(), max_results=num_results or 100,
+                                           progress=progress)
+        with stage('corpus_search') as span:
+            claims = corpus.search(query, language, since, until, limit=num_results)
+            span.rows = len(claims)
+        with stage('parse', rows=len(claims)):
+            result = result_from_claims(claims)
+    else:
+        raise ValueError(f"Unknown search mode: {mode!r}")
+    with stage('normalize_verdicts', rows=len(result)):
+        result.raw_verdicts = result.frame['Verdict']
+        result.frame['Verdict'] = default_normalizer.normalize(result.frame['Verdict'])
+        result.frame['Verdict Grouped'] = group_small_verdicts(result.frame['Verdict'])
+    return result
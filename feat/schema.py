@@ -0,0 +1,123 @@
+"""Compact, typed representation of a search result.
+
+A ``ResultSet`` holds the scalar columns in a DataFrame with categorical sources and verdicts and parsed review
+dates, and the tags once, in CSR form (``TagIndex``): one integer code per (row, tag) pair, row offsets into the
+codes, and the distinct tags as categories. Tag counts, the source–tag pairs of the network and the per-row tag
+lists shown in the table are all derived from that index, so nothing has to explode or re-parse tag lists.
+
+The frame keeps a default ``RangeIndex``, so its index labels are the row positions the tag index refers to, even
+after filtering or sorting.
+"""
+import itertools
+
+from feat.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+SCALAR_COLUMNS = ['Claim', 'Source Name', 'Source URL', 'Verdict', 'Review Publication Date', 'Image URL']
+CATEGORICAL_COLUMNS = ['Source Name', 'Verdict']
+TAGS_COLUMN = 'Tags'
+
+
+class TagIndex:
+    __slots__ = ('codes', 'offsets', 'categories')
+
+    def __init__(self, codes, offsets, categories):
+        self.codes = codes
+        self.offsets = offsets
+        self.categories = categories
+
+    @classmethod
+    def from_lists(cls, tag_lists):
+        lengths = np.fromiter((len(tags) for tags in tag_lists), dtype=np.int64, count=len(tag_lists))
+        flat = np.fromiter(itertools.chain.from_iterable(tag_lists), dtype=object, count=int(lengths.sum()))
+        codes, categories = pd.factorize(flat)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(codes.astype(np.int32), offsets, pd.Index(categories, dtype=object))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def row_ids(self):
+        """Row position of every code, i.e. the row column of the long (row, tag) table."""
+        return np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.offsets))
+
+    def counts(self):
+        """Occurrences per tag, most frequent first, like ``value_counts`` on the exploded tags."""
+        counts = pd.Series(np.bincount(self.codes, minlength=len(self.categories)), index=self.categories,
+                           name=TAGS_COLUMN)
+        return counts.sort_values(ascending=False, kind='mergesort')
+
+    def rows_matching(self, tag_mask):
+        """Boolean row mask of rows carrying at least one tag for which ``tag_mask`` (per category) is true."""
+        hits = np.zeros(len(self), dtype=bool)
+        hits[self.row_ids()[np.asarray(tag_mask, dtype=bool)[self.codes]]] = True
+        return hits
+
+    def lists(self, positions=None):
+        positions = range(len(self)) if positions is None else positions
+        categories = self.categories.values
+        return [list(categories[self.codes[self.offsets[p]:self.offsets[p + 1]]]) for p in positions]
+
+    def joined(self, positions=None, separator=', '):
+        return [separator.join(tags) for tags in self.lists(positions)]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.offsets.nbytes + int(self.categories.memory_usage(deep=True))
+
+
+class ResultSet:
+    def __init__(self, frame, tags, raw_verdicts=None):
+        self.frame = frame
+        self.tags = tags
+        # Verdicts as FactCheckLib returned them, kept for exports once ``frame['Verdict']`` is normalized.
+        self.raw_verdicts = raw_verdicts
+
+    @classmethod
+    def from_records(cls, records, tag_lists):
+        frame = pd.DataFrame.from_records(records, columns=SCALAR_COLUMNS)
+        for col in CATEGORICAL_COLUMNS:
+            frame[col] = frame[col].astype('category')
+        frame['Review Publication Date'] = pd.to_datetime(frame['Review Publication Date'], errors='coerce')
+        return cls(frame, TagIndex.from_lists(tag_lists))
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def columns(self):
+        """Display column order: the scalar columns with ``Tags`` after ``Image URL``, then derived columns."""
+        columns = list(self.frame.columns)
+        columns.insert(columns.index('Image URL') + 1 if 'Image URL' in columns else len(columns), TAGS_COLUMN)
+        return columns
+
+    def source_tag_pairs(self):
+        """Long table of (source, tag) pairs, one row per tag occurrence, both as categoricals."""
+        sources = self.frame['Source Name']
+        return pd.DataFrame({
+            'Source Name': pd.Categorical.from_codes(sources.cat.codes.values[self.tags.row_ids()],
+                                                     categories=sources.cat.categories),
+            TAGS_COLUMN: pd.Categorical.from_codes(self.tags.codes, categories=self.tags.categories),
+        })
+
+    def to_frame(self, positions=None, tags='joined'):
+        """Materialize rows (all, or the given positions) as one flat frame, with tags as lists or joined text."""
+        frame = self.frame if positions is None else self.frame.loc[positions]
+        tag_values = self.tags.joined(frame.index) if tags == 'joined' else self.tags.lists(frame.index)
+        return frame.assign(**{TAGS_COLUMN: tag_values})[self.columns]
+
+    def to_source_frame(self, positions=None):
+        """Rows as FactCheckLib returned them: its columns only, raw verdicts, tags as lists, no categoricals."""
+        frame = self.frame[SCALAR_COLUMNS] if positions is None else self.frame.loc[positions, SCALAR_COLUMNS]
+        frame = frame.astype({col: object for col in CATEGORICAL_COLUMNS})
+        if self.raw_verdicts is not None:
+            frame['Verdict'] = self.raw_verdicts.loc[frame.index].astype(object)
+        frame[TAGS_COLUMN] = self.tags.lists(frame.index)
+        return frame
+
+    def memory_usage(self):
+        raw_bytes = int(self.raw_verdicts.memory_usage(deep=True)) if self.raw_verdicts is not None else 0
+        return int(self.frame.memory_usage(deep=True).sum()) + self.tags.nbytes + raw_bytes
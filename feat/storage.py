@@ -0,0 +1,43 @@
+"""Building blocks of the on-disk stores shared by all worker processes.
+
+``SQLiteStore`` is the base of the SQLite-backed stores (result cache, corpus, metrics, comparison aggregates): a
+fresh WAL-mode connection per call, and the schema created on first use. ``evict_lru`` is the size-bounded
+least-recently-used eviction they and the file-based stores apply after writing.
+"""
+import os
+import sqlite3
+
+
+class SQLiteStore:
+    """A SQLite file at ``path``; subclasses set ``schema`` to the script that creates their tables."""
+
+    schema = ''
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(self.schema)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+
+def evict_lru(entries, max_bytes, remove):
+    """Drop the least recently used of ``(last used, size, key)`` ``entries`` until at most ``max_bytes`` remain.
+
+    ``remove(key)`` deletes one entry; returns how many were removed.
+    """
+    entries = sorted(entries, key=lambda entry: entry[0])
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, key in entries:
+        if total <= max_bytes:
+            break
+        remove(key)
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,120 @@
+"""Server-side store for search results (``feat.schema.ResultSet``).
+
+Callbacks only exchange a small handle through ``dcc.Store``; the result itself lives here. Every result is written
+to a spill directory shared by all workers, and the most recently used ones are also kept in memory up to a byte
+bound. Both tiers evict least recently used results first.
+"""
+import hashlib
+import os
+import pickle
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from feat.lazy import lazy_import
+from feat.storage import evict_lru
+
+pd = lazy_import('pandas')
+
+DEFAULT_SPILL_DIR = os.environ.get('FEAT_STORE_DIR', os.path.join('.feat_cache', 'results'))
+DEFAULT_MAX_MEMORY_BYTES = int(os.environ.get('FEAT_STORE_MAX_MEMORY_BYTES', 256 * 1024 * 1024))
+DEFAULT_MAX_DISK_BYTES = int(os.environ.get('FEAT_STORE_MAX_DISK_BYTES', 2 * 1024 * 1024 * 1024))
+
+
+class ResultStore:
+    def __init__(self, spill_dir=DEFAULT_SPILL_DIR, max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.spill_dir = spill_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._results = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # Stored results are unpickled, so only this user may write there.
+        os.makedirs(spill_dir, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def _valid_key(key):
+        # Keys come back from the browser, so never let them name anything outside the spill directory.
+        return isinstance(key, str) and re.fullmatch(r'[0-9a-f]{32}', key) is not None
+
+    def _path(self, key):
+        return os.path.join(self.spill_dir, f'{key}.pkl')
+
+    def put(self, result, previous=None):
+        """Store ``result`` and return its key; ``previous`` (the session's last key) is discarded."""
+        if previous:
+            self.discard(previous)
+        key = uuid.uuid4().hex
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._remember(key, result)
+        self._evict_disk()
+        return key
+
+    def get(self, key):
+        """Return the result stored under ``key``, or ``None`` if it was evicted or never existed."""
+        if not self._valid_key(key):
+            return None
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+        try:
+            # Touch the spill file so disk eviction also sees this result as recently used.
+            os.utime(self._path(key))
+            if cached is not None:
+                return cached[0]
+            with open(self._path(key), 'rb') as f:
+                result = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return cached[0] if cached is not None else None
+        self._remember(key, result)
+        return result
+
+    def discard(self, key):
+        if not self._valid_key(key):
+            return
+        with self._lock:
+            if key in self._results:
+                self._memory_bytes -= self._results.pop(key)[1]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _remember(self, key, result):
+        size = result.memory_usage()
+        with self._lock:
+            if key in self._results:
+                self._memory_bytes -= self._results.pop(key)[1]
+            self._results[key] = (result, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and len(self._results) > 1:
+                self._memory_bytes -= self._results.popitem(last=False)[1][1]
+
+    def _evict_disk(self):
+        entries = []
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith('.pkl'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.name[:-len('.pkl')]))
+        evict_lru(entries, self.max_disk_bytes, self.discard)
+
+    def stats(self):
+        with self._lock:
+            return {'memory_entries': len(self._results), 'memory_bytes': self._memory_bytes}
+
+
+def result_digest(result):
+    """Content hash of a ``ResultSet``, used to memoize everything derived from it."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(result.frame, index=False).values.tobytes())
+    digest.update(result.tags.codes.tobytes())
+    digest.update(result.tags.offsets.tobytes())
+    digest.update(pd.util.hash_pandas_object(result.tags.categories, index=False).values.tobytes())
+    if result.raw_verdicts is not None:
+        digest.update(pd.util.hash_pandas_object(result.raw_verdicts, index=False).values.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,255 @@
+"""Server-side filtering, sorting and paging for ``factcheck-table``.
+
+Dash DataTable in ``custom`` mode sends its ``filter_query`` string, ``sort_by`` list and page position to the
+server; these helpers translate them into vectorized pandas operations on the stored result frame so only the
+current page is serialized.
+"""
+import math
+import re
+
+from feat.lazy import lazy_import
+from feat.metrics import stage
+from feat.schema import TAGS_COLUMN
+
+pd = lazy_import('pandas')
+
+# Dash filter syntax: ``{column} <operator> <value>`` and ``{column} is <test>`` clauses, combined with ``&&``/``and``,
+# ``||``/``or``, ``!``/``not`` and parentheses. Operators take an ``s`` (case-sensitive) or ``i`` (case-insensitive)
+# prefix; unquoted values may run over several words.
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<column>\{(?:[^}\\]|\\.)*\})
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`(?:[^`\\]|\\.)*`)
+  | (?P<paren>[()])
+  | (?P<logical>&&|\|\||(?:and|or)(?![^\s()]))
+  | (?P<test>is\s+(?:blank|nil|str|num|bool|object|even|odd|prime)(?![^\s()]))
+  | (?P<relational>[si]?(?:>=|<=|!=|=|<|>)|[si]?(?:eq|ne|lt|le|gt|ge|contains|datestartswith)(?![^\s()]))
+  | (?P<negation>!|not(?![^\s()]))
+  | (?P<word>[^\s()]+)
+)""", re.VERBOSE)
+_SYMBOLS = {'=': 'eq', '!=': 'ne', '<': 'lt', '<=': 'le', '>': 'gt', '>=': 'ge'}
+_LOGICAL = {'&&': 'and', 'and': 'and', '||': 'or', 'or': 'or'}
+
+
+def _tokens(filter_query):
+    tokens, position, text = [], 0, filter_query.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+def _unescape(text):
+    return re.sub(r'\\(.)', r'\1', text[1:-1])
+
+
+class _FilterParser:
+    """Recursive-descent parser over the tokens of one filter query; ``||`` binds looser than ``&&``."""
+
+    def __init__(self, filter_query):
+        self.filter_query = filter_query
+        self.tokens = _tokens(filter_query)
+        self.position = 0
+
+    def error(self, reason):
+        return ValueError(f"Unsupported filter expression {self.filter_query!r}: {reason}")
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.logical('or')
+        if self.position < len(self.tokens):
+            raise self.error(f"unexpected {self.peek()[1]!r}")
+        return node
+
+    def logical(self, kind):
+        operands = [self.logical('and') if kind == 'or' else self.unary()]
+        while self.peek()[0] == 'logical' and _LOGICAL[self.peek()[1]] == kind:
+            self.take()
+            operands.append(self.logical('and') if kind == 'or' else self.unary())
+        return operands[0] if len(operands) == 1 else (kind, tuple(operands))
+
+    def unary(self):
+        kind, text = self.peek()
+        if kind == 'negation':
+            self.take()
+            return ('not', self.unary())
+        if text == '(':
+            self.take()
+            node = self.logical('or')
+            if self.take()[1] != ')':
+                raise self.error("missing ')'")
+            return node
+        return self.clause()
+
+    def clause(self):
+        kind, text = self.take()
+        if kind not in ('column', 'word'):
+            raise self.error(f"expected a column, got {text!r}" if text else "expected a column")
+        column = _unescape(text) if kind == 'column' else text
+        kind, operator = self.take()
+        if kind == 'test':
+            return ('clause', column, 'is ' + operator.split()[-1], None, True)
+        if kind != 'relational':
+            raise self.error(f"expected an operator after {column!r}")
+        case_sensitive = operator[0] != 'i'
+        if operator[0] in 'si':
+            operator = operator[1:]
+        operator = _SYMBOLS.get(operator, operator)
+        return ('clause', column, operator, self.value(), case_sensitive)
+
+    def value(self):
+        kind, text = self.take()
+        if kind == 'string':
+            return _unescape(text)
+        if kind != 'word':
+            raise self.error("missing value")
+        words = [text]
+        while self.peek()[0] == 'word':
+            words.append(self.take()[1])
+        return ' '.join(words)
+
+
+def parse_filter(filter_query):
+    """Parse a Dash ``filter_query`` into a tree, or ``None`` if it is empty.
+
+    Nodes are ``('and', operands)``, ``('or', operands)``, ``('not', operand)`` and
+    ``('clause', column, operator, value, case_sensitive)``, where ``operator`` is one of ``eq``, ``ne``, ``lt``,
+    ``le``, ``gt``, ``ge``, ``contains``, ``datestartswith`` or ``is <test>`` (with a ``None`` value). Raises
+    ``ValueError`` for queries outside the Dash filter syntax.
+    """
+    if not (filter_query or '').strip():
+        return None
+    return _FilterParser(filter_query).parse()
+
+
+def display_column(result, column, index=None):
+    """Return ``column`` of a ``ResultSet`` as shown in the table: tags comma-joined, categoricals as values."""
+    frame = result.frame if index is None else result.frame.loc[index]
+    if column == TAGS_COLUMN:
+        return pd.Series(result.tags.joined(frame.index), index=frame.index, dtype=object)
+    series = frame[column]
+    if pd.api.types.is_categorical_dtype(series):
+        return series.astype(object)
+    return series
+
+
+def _is_instance(series, types):
+    return series.map(lambda value: isinstance(value, types) and not isinstance(value, bool), na_action='ignore')
+
+
+def _numbers(series):
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+    return series.where(_is_instance(series, (int, float)).fillna(False).astype(bool)).astype(float)
+
+
+def _is_prime(number):
+    if number < 2 or number != int(number):
+        return False
+    return all(number % divisor for divisor in range(2, math.isqrt(int(number)) + 1))
+
+
+def _test_mask(series, test):
+    if test == 'blank':
+        return series.isna() | (series.astype(str).str.strip() == '')
+    if test == 'nil':
+        return series.isna()
+    if test == 'bool':
+        return (series.notna() if pd.api.types.is_bool_dtype(series)
+                else series.map(lambda value: isinstance(value, bool), na_action='ignore'))
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Series(False, index=series.index)
+    if test == 'str':
+        return _is_instance(series, str)
+    if test == 'object':
+        return _is_instance(series, (dict, list))
+    numbers = _numbers(series)
+    if test == 'num':
+        return numbers.notna()
+    if test == 'prime':
+        # Few distinct values in practice; test each one once.
+        primes = {number for number in numbers.dropna().unique() if _is_prime(number)}
+        return numbers.isin(primes)
+    return numbers.mod(2).eq(0 if test == 'even' else 1)
+
+
+def _clause_mask(result, column, operator, value, case_sensitive):
+    if column not in result.columns:
+        # Clauses on columns the table does not show leave the rows alone.
+        return pd.Series(True, index=result.frame.index)
+    if column == TAGS_COLUMN and operator == 'contains':
+        # Match against the distinct tags once instead of every row's joined tag text.
+        tag_mask = result.tags.categories.str.contains(str(value), case=case_sensitive, regex=False)
+        return pd.Series(result.tags.rows_matching(tag_mask), index=result.frame.index)
+    series = display_column(result, column)
+    if operator.startswith('is '):
+        return _test_mask(series, operator[3:]).fillna(False).astype(bool)
+    if operator in ('contains', 'datestartswith'):
+        text = series.astype(str).where(series.notna(), '')
+        if operator == 'contains':
+            return text.str.contains(str(value), case=case_sensitive, regex=False)
+        return text.str.startswith(str(value))
+    if pd.api.types.is_datetime64_any_dtype(series):
+        value = pd.to_datetime(value, errors='coerce')
+    elif pd.api.types.is_numeric_dtype(series):
+        value = pd.to_numeric(value, errors='coerce')
+    elif not case_sensitive:
+        series, value = series.str.lower(), value.lower()
+    return getattr(series, operator)(value).fillna(False).astype(bool)
+
+
+def _filter_mask(result, node):
+    kind = node[0]
+    if kind == 'clause':
+        return _clause_mask(result, *node[1:])
+    if kind == 'not':
+        return ~_filter_mask(result, node[1])
+    masks = [_filter_mask(result, operand) for operand in node[1]]
+    mask = masks[0]
+    for other in masks[1:]:
+        mask = mask & other if kind == 'and' else mask | other
+    return mask
+
+
+def apply_filter(result, filter_query):
+    """Return the filtered rows of ``result.frame``; its index labels are row positions in ``result``."""
+    tree = parse_filter(filter_query)
+    if tree is None:
+        return result.frame
+    return result.frame[_filter_mask(result, tree)]
+
+
+def _sort_key(series):
+    if pd.api.types.is_categorical_dtype(series):
+        return series.astype(object)
+    return series
+
+
+def apply_sort(result, view, sort_by):
+    sort_by = [s for s in sort_by or [] if s['column_id'] in result.columns]
+    if not sort_by:
+        return view
+    columns = [s['column_id'] for s in sort_by]
+    if TAGS_COLUMN in columns:
+        view = view.assign(**{TAGS_COLUMN: result.tags.joined(view.index)})
+    return view.sort_values(columns, ascending=[s['direction'] == 'asc' for s in sort_by], kind='mergesort',
+                            na_position='last', key=_sort_key)
+
+
+def table_page(result, page_current, page_size, sort_by=None, filter_query=None):
+    """Filter, sort and slice a ``ResultSet``; return ``(records, page_count)`` for the requested page only."""
+    with stage('table_filter_sort', rows=len(result)):
+        view = apply_sort(result, apply_filter(result, filter_query), sort_by)
+    page_size = page_size or 10
+    page_count = max(1, math.ceil(len(view) / page_size))
+    page_current = min(page_current or 0, page_count - 1)
+    page = view.iloc[page_current * page_size:(page_current + 1) * page_size]
+    with stage('table_serialize', rows=len(page)):
+        return result.to_frame(positions=page.index).to_dict('records'), page_count
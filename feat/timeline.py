@@ -0,0 +1,91 @@
+"""Time-bucketed claim counts for the timeline chart.
+
+Review dates are floored to day, week or month buckets, whichever is the finest that keeps the chart under
+``MAX_BUCKETS`` bars, and counted per grouped verdict in one groupby, so the figure carries one value per bucket and
+verdict instead of one marker per claim.
+"""
+import os
+
+from feat.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+DATE_COLUMN = 'Review Publication Date'
+VERDICT_COLUMN = 'Verdict Grouped'
+MAX_BUCKETS = int(os.environ.get('FEAT_TIMELINE_MAX_BUCKETS', 120))
+
+# (bucket, numpy unit, approximate days per bucket, pandas frequency of the bucket starts)
+BUCKETS = [
+    ('day', 'D', 1, 'D'),
+    ('week', 'W', 7, 'W-MON'),
+    ('month', 'M', 30.44, 'MS'),
+]
+
+
+def bucket_for_span(start, end, max_buckets=MAX_BUCKETS):
+    """Finest bucket that splits ``start``..``end`` into at most ``max_buckets`` buckets (month at the coarsest)."""
+    span_days = (end - start) / pd.Timedelta(days=1) + 1
+    for bucket, _, days, _ in BUCKETS:
+        if span_days / days <= max_buckets:
+            return bucket
+    return BUCKETS[-1][0]
+
+
+def bucket_starts(dates, bucket):
+    """Floor a ``datetime64[ns]`` array to the start of its day, Monday-based week or month."""
+    unit = {name: unit for name, unit, _, _ in BUCKETS}[bucket]
+    if unit == 'W':
+        # numpy's weeks start on Thursday, 1970-01-01; shifting by three days makes them start on Monday.
+        shift = np.timedelta64(3, 'D')
+        return ((dates + shift).astype('datetime64[W]') - shift).astype('datetime64[ns]')
+    return dates.astype(f'datetime64[{unit}]').astype('datetime64[ns]')
+
+
+def timeline_counts(result, bucket=None, max_buckets=MAX_BUCKETS):
+    """Claims per time bucket and verdict, as a frame indexed by bucket start with one column per verdict.
+
+    Buckets without claims are included as zero rows, and verdict columns are ordered by total count. Rows without a
+    review date are left out. Returns ``(counts, bucket)``.
+    """
+    frame = result.frame
+    dates = frame[DATE_COLUMN].values
+    valid = ~np.isnat(dates)
+    dates = dates[valid]
+    if not len(dates):
+        return pd.DataFrame(index=pd.DatetimeIndex([], name=DATE_COLUMN)), bucket or BUCKETS[0][0]
+    start, end = dates.min(), dates.max()
+    bucket = bucket or bucket_for_span(pd.Timestamp(start), pd.Timestamp(end), max_buckets)
+    keys = pd.DataFrame({DATE_COLUMN: bucket_starts(dates, bucket),
+                         VERDICT_COLUMN: frame[VERDICT_COLUMN].values[valid]})
+    counts = keys.groupby([DATE_COLUMN, VERDICT_COLUMN], observed=True, sort=False).size().unstack(fill_value=0)
+    freq = {name: freq for name, _, _, freq in BUCKETS}[bucket]
+    # The range comes from the dates, not the counts: claims without a verdict are dated but not counted.
+    first, last = bucket_starts(np.array([start, end]), bucket)
+    index = pd.date_range(first, last, freq=freq, name=DATE_COLUMN)
+    counts = counts.reindex(index, fill_value=0)
+    counts = counts[counts.sum().sort_values(ascending=False, kind='mergesort').index]
+    counts.columns = counts.columns.astype(object)
+    return counts, bucket
+
+
+def comparison_counts(comparison, bucket=None, max_buckets=MAX_BUCKETS):
+    """Claims per time bucket and compared query, from each query's per-day counts; returns ``(counts, bucket)``.
+
+    Indexed like ``timeline_counts``, with one column per query label in comparison order.
+    """
+    labels = comparison.labels()
+    days = {label: (np.array(list(aggregates.days), dtype='datetime64[ns]'),
+                    np.fromiter(aggregates.days.values(), dtype=np.int64, count=len(aggregates.days)))
+            for label, aggregates in zip(labels, comparison.queries.values())}
+    known = [dates for dates, _ in days.values() if len(dates)]
+    if not known:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name=DATE_COLUMN), columns=labels), bucket or BUCKETS[0][0]
+    start, end = min(dates.min() for dates in known), max(dates.max() for dates in known)
+    bucket = bucket or bucket_for_span(pd.Timestamp(start), pd.Timestamp(end), max_buckets)
+    freq = {name: freq for name, _, _, freq in BUCKETS}[bucket]
+    index = pd.date_range(bucket_starts(np.array([start]), bucket)[0], bucket_starts(np.array([end]), bucket)[0],
+                          freq=freq, name=DATE_COLUMN)
+    counts = pd.DataFrame({label: pd.Series(day_counts, dtype=np.int64).groupby(bucket_starts(dates, bucket)).sum()
+                           for label, (dates, day_counts) in days.items()}, index=index)
+    return counts.fillna(0).astype(np.int64), bucket
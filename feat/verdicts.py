@@ -0,0 +1,161 @@
+"""Single-pass verdict normalization.
+
+Raw verdicts are lower-cased, stripped of trailing dots and rewritten through one compiled regex built from the
+per-language synonym tables below. Phrases only match as whole tokens and the longest phrase wins, so the result
+no longer depends on the order of the table. Each distinct raw verdict is normalized once and the result is mapped
+back onto the column through its categorical codes.
+"""
+import re
+
+from feat.lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+VERDICT_SYNONYMS = {
+    'en': {
+        'fake': 'false',
+        'incorrect': 'false',
+        'scam': 'false',
+        'pants on fire': 'false',
+        'four pinocchios': 'false',
+        'three pinocchios': 'mostly false',
+        'false content/false': 'false',
+        'false context/false': 'false',
+        'misleading/partly false': 'mostly false',
+        'mostly true': 'half true',
+        'correct': 'true',
+        'correct attribution': 'true',
+    },
+    'es': {
+        'falso': 'false',
+        'falsa': 'false',
+        'falso!': 'false',
+        'es falso': 'false',
+        'incorrecto': 'false',
+        'engañoso': 'mostly false',
+        'verdadero': 'true',
+        'cierto': 'true',
+    },
+    'pt': {
+        'errado': 'false',
+        'enganoso': 'false',
+        'enganador': 'mostly false',
+        'partialmente falso': 'mostly false',
+    },
+    'fr': {
+        'faux': 'false',
+        "c'est faux": 'false',
+        'trompeur': 'false',
+    },
+    'it': {
+        'notizia falsa': 'false',
+        'pinocchio andante': 'false',
+        "c'eri quasi": 'half true',
+        'notizia vera': 'true',
+        'vera': 'true',
+        'vero': 'true',
+    },
+    'de': {
+        'falsch': 'false',
+    },
+    'nl': {
+        'misleidend': 'misleading',
+    },
+    'ro': {
+        'fals': 'false',
+    },
+    'sv': {
+        'falskt': 'false',
+    },
+    'pl': {
+        'fałsz': 'false',
+        'falsz': 'false',
+    },
+    'fi': {
+        'epätosi': 'false',
+    },
+    'sr': {
+        'delimično netačno': 'mostly false',
+    },
+    'tr': {
+        'yanlış': 'false',
+        'çok yanlış': 'false',
+        'doğru': 'true',
+        'dogru': 'true',
+        'doğruluk payı vardır': 'half true',
+    },
+    'ru': {
+        'неверно': 'false',
+        'правильно': 'true',
+    },
+    'uk': {
+        'помилковий': 'false',
+        'вірно': 'true',
+    },
+    'ar': {
+        'مضلل': 'false',
+        'زائف': 'false',
+    },
+    'fa': {
+        'نادرست': 'false',
+    },
+    'bn': {
+        'মিথ্যা': 'false',
+        'অসত্য': 'false',
+    },
+    'zh': {
+        '錯誤': 'false',
+        '錯誤的': 'false',
+        '部分錯誤': 'false',
+        '正確的': 'true',
+    },
+    'ja': {
+        '錯誤な': 'false',
+        '正しい': 'true',
+    },
+}
+
+
+class VerdictNormalizer:
+    def __init__(self, synonyms=VERDICT_SYNONYMS, languages=None):
+        self.mapping = {}
+        for language, table in synonyms.items():
+            if languages is None or language in languages:
+                self.mapping.update(table)
+        phrases = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(p) for p in phrases) + r')(?!\w)')
+
+    def normalize_one(self, verdict):
+        if not isinstance(verdict, str):
+            return verdict
+        text = verdict.rstrip('.').lower().strip()
+        if text in self.mapping:
+            return self.mapping[text]
+        return self.pattern.sub(lambda match: self.mapping[match.group(0)], text)
+
+    def normalize(self, verdicts):
+        """Normalize a Series of raw verdicts, returning a categorical Series on the same index."""
+        codes, uniques = pd.factorize(verdicts)
+        normalized_codes, categories = pd.factorize(np.array([self.normalize_one(v) for v in uniques], dtype=object))
+        # With no verdict at all there is nothing to take from; every code is already -1 (missing).
+        if len(uniques):
+            codes = np.where(codes >= 0, normalized_codes.take(codes, mode='clip'), -1)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=verdicts.index,
+                         name=verdicts.name)
+
+
+def group_small_verdicts(verdicts, threshold=2, other='other'):
+    """Fold verdicts below ``threshold`` percent of the rows into ``other``."""
+    verdicts = verdicts.astype('category')
+    shares = verdicts.value_counts(normalize=True) * 100
+    small = shares[shares < threshold].index
+    if len(small) == 0:
+        return verdicts
+    if other not in verdicts.cat.categories:
+        verdicts = verdicts.cat.add_categories([other])
+    grouped = verdicts.where(~verdicts.isin(small), other)
+    return grouped.cat.remove_unused_categories()
+
+
+default_normalizer = VerdictNormalizer()
@@ -0,0 +1,101 @@
+"""Paged fetching against the local stub server, replaying recorded responses with overlapping pages."""
+import os
+
+import pytest
+import requests
+
+from benchmarks.common import encode_response, install_factchecklib_stub, make_claims
+from benchmarks.stub_server import start_server
+from feat.fetch import PagedFetcher
+
+install_factchecklib_stub()
+
+
+def claim(i):
+    return {'Claim': f'Claim {i}', 'Source Name': 'Source', 'Source URL': f'https://example.org/{i}',
+            'Verdict': 'False', 'Review Publication Date': '2020-01-01 00:00:00', 'Image URL': None, 'Tags': []}
+
+
+# ``<offset>-<num_results>`` -> claim numbers. Like the live API, results shift while a search is paged, so a page
+# may repeat claims from the one before it; 'short' has fewer results than were asked for.
+RECORDED = {
+    'overlap/0-4': [0, 1, 2, 3],
+    'overlap/4-4': [3, 4, 5, 6],
+    'overlap/8-2': [6, 7],
+    # More results than were asked for.
+    'overlap/4-2': [4, 5, 6, 7],
+    'short/0-4': [10, 11, 12, 13],
+    'short/4-4': [14, 15],
+    'short/8-4': [16, 17, 18, 19],
+}
+
+
+@pytest.fixture(scope='module')
+def replay_dir(tmp_path_factory):
+    root = tmp_path_factory.mktemp('replay')
+    for name, numbers in RECORDED.items():
+        path = root / f'{name}.txt'
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(encode_response([claim(i) for i in numbers]), encoding='utf-8')
+    return root
+
+
+@pytest.fixture(scope='module')
+def servers(replay_dir):
+    started = {}
+    for name in ('overlap', 'short'):
+        for fail_rate in (0.0, 0.5, 1.0):
+            started[name, fail_rate] = start_server(replay_dir=os.path.join(replay_dir, name), fail_rate=fail_rate)
+    yield {key: url for key, (_, url) in started.items()}
+    for server, _ in started.values():
+        server.shutdown()
+        server.server_close()
+
+
+def fetcher(url, retries=0, page_size=4):
+    return PagedFetcher(url=url, page_size=page_size, max_workers=3, retries=retries, backoff=0)
+
+
+def numbers(claims):
+    return [int(claim['Claim'].split()[-1]) for claim in claims]
+
+
+def test_pages_are_merged_in_offset_order_without_duplicates(servers):
+    progress = []
+    claims = fetcher(servers['overlap', 0.0]).fetch('query', num_results=10,
+                                                    progress=lambda done, total: progress.append((done, total)))
+    assert numbers(claims) == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_results_are_cut_at_num_results(servers):
+    assert numbers(fetcher(servers['overlap', 0.0]).fetch('query', num_results=6)) == [0, 1, 2, 3, 4, 5]
+
+
+def test_transient_errors_are_retried(servers):
+    claims = fetcher(servers['overlap', 0.5], retries=20).fetch('query', num_results=10)
+    assert numbers(claims) == [0, 1, 2, 3, 4, 5, 6, 7]
+
+
+def test_persistent_errors_raise(servers):
+    with pytest.raises(requests.exceptions.RequestException):
+        fetcher(servers['overlap', 1.0], retries=2).fetch('query', num_results=10)
+
+
+def test_iter_pages_stops_after_a_short_page(servers):
+    pages = list(fetcher(servers['short', 0.0]).iter_pages('query', num_results=12))
+    assert [numbers(page) for page in pages] == [[10, 11, 12, 13], [14, 15]]
+
+
+def test_iter_pages_retries(servers):
+    pages = list(fetcher(servers['short', 0.5], retries=20).iter_pages('query', num_results=12))
+    assert [numbers(page) for page in pages] == [[10, 11, 12, 13], [14, 15]]
+
+
+def test_large_search_over_many_pages(servers):
+    # Offsets nothing was recorded for are generated by the stub, the same claims at the same offsets every time.
+    progress = []
+    claims = fetcher(servers['short', 0.0], page_size=100).fetch(
+        'query', num_results=1050, progress=lambda done, total: progress.append(done))
+    assert [c['Source URL'] for c in claims] == [c['Source URL'] for c in make_claims(1050)]
+    assert progress == list(range(1, 12))
@@ -0,0 +1,70 @@
+"""Pruning of the source–tag network: ``top_k`` and ``min_weight`` must never leave an empty graph by accident."""
+import random
+
+import pandas as pd
+import pytest
+
+from feat.ingest import result_from_claims
+from feat.network import build_network, network_tables, prune_network
+
+
+def make_result(n, seed=0):
+    """``n`` claims where a few sources publish most checks and each carries up to four of 300 tags."""
+    rng = random.Random(seed)
+    claims = []
+    for i in range(n):
+        source = f'Source {min(int(rng.paretovariate(1.2)) - 1, 99)}'
+        claims.append({
+            'Claim': f'Claim {i}', 'Source Name': source, 'Source URL': f'https://example.org/{i}',
+            'Verdict': 'False', 'Review Publication Date': '2020-01-01 00:00:00', 'Image URL': None,
+            'Tags': list(dict.fromkeys(f'tag{rng.randrange(300)}' for _ in range(rng.randint(0, 4)))),
+        })
+    return result_from_claims(claims)
+
+
+@pytest.mark.parametrize('rows', [300, 10_000])
+@pytest.mark.parametrize('top_k', [1, 2, 5, 10, 2.5])
+def test_top_k_keeps_an_edge(rows, top_k):
+    nodes, edges = network_tables(make_result(rows), top_k=top_k)
+    assert len(edges) > 0
+    assert (nodes['kind'] == 'source').sum() <= int(top_k)
+    assert (nodes['kind'] == 'tag').sum() <= int(top_k)
+    assert set(edges['source']) == set(nodes.loc[nodes['kind'] == 'source', 'name'])
+    assert set(edges['target']) == set(nodes.loc[nodes['kind'] == 'tag', 'name'])
+
+
+def test_top_k_keeps_the_highest_degree_source():
+    nodes, _ = network_tables(make_result(1000))
+    _, edges = network_tables(make_result(1000), top_k=1)
+    sources = nodes[nodes['kind'] == 'source']
+    assert edges['source'].unique().tolist() == [sources.loc[sources['degree'].idxmax(), 'name']]
+
+
+def test_top_k_with_min_weight_keeps_an_edge():
+    _, edges = network_tables(make_result(10_000), top_k=3, min_weight=5)
+    assert len(edges) > 0
+    assert (edges['weight'] >= 5).all()
+
+
+@pytest.mark.parametrize('top_k', [None, 0, -3])
+def test_top_k_below_one_keeps_everything(top_k):
+    result = make_result(300)
+    nodes, edges = network_tables(result, top_k=top_k)
+    assert len(edges) == len(result.source_tag_pairs().drop_duplicates())
+    # Sources without any tag still get a node.
+    assert set(nodes.loc[nodes['kind'] == 'source', 'name']) == set(result.frame['Source Name'].astype(str))
+
+
+def test_prune_without_edges():
+    edges = pd.DataFrame({'source': pd.Series(dtype=str), 'target': pd.Series(dtype=str),
+                          'weight': pd.Series(dtype='int64')})
+    nodes, pruned = prune_network(edges, top_k=5)
+    assert nodes.empty and pruned.empty
+
+
+def test_elements_reference_existing_nodes():
+    elements = build_network(make_result(300), top_k=5)
+    ids = {element['data']['id'] for element in elements if 'id' in element['data']}
+    links = [element['data'] for element in elements if 'source' in element['data']]
+    assert links
+    assert all(link['source'] in ids and link['target'] in ids for link in links)
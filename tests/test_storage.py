@@ -0,0 +1,67 @@
+"""The shared store building blocks and the comparison aggregates built on them."""
+import json
+import os
+import zlib
+
+from feat.compare import AggregateStore, QueryAggregates
+from feat.storage import SQLiteStore, evict_lru
+
+
+def test_evict_lru_removes_least_recently_used_first():
+    removed = []
+    entries = [(3.0, 40, 'c'), (1.0, 30, 'a'), (2.0, 50, 'b'), (4.0, 10, 'd')]
+    assert evict_lru(entries, 60, removed.append) == 2
+    assert removed == ['a', 'b']
+
+
+def test_evict_lru_within_bound():
+    removed = []
+    assert evict_lru([(1.0, 30, 'a'), (2.0, 30, 'b')], 60, removed.append) == 0
+    assert evict_lru([], 0, removed.append) == 0
+    assert removed == []
+
+
+def test_sqlite_store_creates_directory_and_schema(tmp_path):
+    class Notes(SQLiteStore):
+        schema = 'CREATE TABLE IF NOT EXISTS notes (text TEXT);'
+
+    path = os.path.join(tmp_path, 'nested', 'notes.sqlite3')
+    Notes(path)
+    store = Notes(path)
+    with store._connect() as conn:
+        assert conn.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+        assert conn.execute('SELECT COUNT(*) FROM notes').fetchone() == (0,)
+
+
+def aggregates(digest, source='Source'):
+    return QueryAggregates(digest, f'query {digest}', 3, verdicts={'false': 2, 'true': 1}, sources={source: 3},
+                           days={'2020-01-01': 3}, pairs={(source, 'tag'): 2})
+
+
+def test_aggregate_store_round_trip(tmp_path):
+    store = AggregateStore(os.path.join(tmp_path, 'aggregates.sqlite3'))
+    store.put(aggregates('a'))
+    loaded = store.get('a')
+    assert (loaded.label, loaded.rows, loaded.verdicts, loaded.sources, loaded.days, loaded.pairs) == (
+        'query a', 3, {'false': 2, 'true': 1}, {'Source': 3}, {'2020-01-01': 3}, {('Source', 'tag'): 2})
+    assert store.get('missing') is None
+
+
+def test_aggregate_store_evicts_least_recently_used(tmp_path):
+    sizes = {digest: len(aggregates(digest).to_payload()) for digest in 'abc'}
+    # Room for two entries, not three (compressed sizes differ by a byte or so).
+    store = AggregateStore(os.path.join(tmp_path, 'aggregates.sqlite3'), max_bytes=sizes['a'] * 5 // 2)
+    store.put(aggregates('a'))
+    store.put(aggregates('b'))
+    store.get('a')
+    store.put(aggregates('c'))
+    assert store.get('b') is None
+    assert store.get('a') is not None and store.get('c') is not None
+    assert store.stats() == {'entries': 2, 'bytes': sizes['a'] + sizes['c']}
+
+
+def test_payload_with_tag_counts_still_loads():
+    payload = zlib.compress(json.dumps({
+        'digest': 'a', 'label': 'query a', 'rows': 1, 'verdicts': {}, 'sources': {'Source': 1}, 'tags': {'tag': 1},
+        'days': {}, 'pairs': [['Source', 'tag', 1]]}).encode('utf-8'))
+    assert QueryAggregates.from_payload(payload).pairs == {('Source', 'tag'): 1}
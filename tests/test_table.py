@@ -0,0 +1,102 @@
+"""Dash ``filter_query`` parsing and its vectorized evaluation on a ``ResultSet``."""
+import pytest
+
+from feat.ingest import result_from_claims
+from feat.table import apply_filter, parse_filter, table_page
+
+CLAIMS = [
+    # Claim, Source Name, Verdict, Review Publication Date, Tags
+    ('Vaccines contain microchips', 'Reuters', 'False', '2021-03-02 10:00:00', ['health', 'vaccines']),
+    ('The moon landing was staged', 'AFP', 'false', '2020-07-20 00:00:00', ['space']),
+    ('Minimum wage rose in 2022', 'PolitiFact', 'True', '2022-01-15 00:00:00', ['economy', 'Wages']),
+    ('Drinking bleach cures covid', 'Reuters', 'Pants on Fire', '2020-04-24 00:00:00', ['health', 'covid']),
+    ('Unknown claim', None, None, None, []),
+]
+
+
+@pytest.fixture(scope='module')
+def result():
+    return result_from_claims([
+        {'Claim': claim, 'Source Name': source, 'Source URL': f'https://example.org/{i}', 'Verdict': verdict,
+         'Review Publication Date': date, 'Image URL': None, 'Tags': tags}
+        for i, (claim, source, verdict, date, tags) in enumerate(CLAIMS)])
+
+
+def claims(result, filter_query):
+    return apply_filter(result, filter_query)['Claim'].tolist()
+
+
+@pytest.mark.parametrize('filter_query, tree', [
+    ('', None),
+    ('{Verdict} = False', ('clause', 'Verdict', 'eq', 'False', True)),
+    ('{Verdict} i= false', ('clause', 'Verdict', 'eq', 'false', False)),
+    ('{Verdict} ieq false', ('clause', 'Verdict', 'eq', 'false', False)),
+    ('{Verdict} s!= "Pants on Fire"', ('clause', 'Verdict', 'ne', 'Pants on Fire', True)),
+    ('{Claim} i< m', ('clause', 'Claim', 'lt', 'm', False)),
+    ('{Claim} contains new york', ('clause', 'Claim', 'contains', 'new york', True)),
+    (r'{Claim} icontains "say \"hi\""', ('clause', 'Claim', 'contains', 'say "hi"', False)),
+    (r'{Odd \} name} = x', ('clause', 'Odd } name', 'eq', 'x', True)),
+    ('Verdict sdatestartswith 2020', ('clause', 'Verdict', 'datestartswith', '2020', True)),
+    ('{Tags} is nil', ('clause', 'Tags', 'is nil', None, True)),
+    ('!{Tags} is blank', ('not', ('clause', 'Tags', 'is blank', None, True))),
+    ('{a} = 1 && {b} = 2 || {c} = 3', ('or', (('and', (('clause', 'a', 'eq', '1', True),
+                                                       ('clause', 'b', 'eq', '2', True))),
+                                              ('clause', 'c', 'eq', '3', True)))),
+    ('{a} = 1 and ({b} = 2 or not {c} is even)', ('and', (('clause', 'a', 'eq', '1', True),
+                                                          ('or', (('clause', 'b', 'eq', '2', True),
+                                                                  ('not', ('clause', 'c', 'is even', None, True))))))),
+])
+def test_parse_filter(filter_query, tree):
+    assert parse_filter(filter_query) == tree
+
+
+@pytest.mark.parametrize('filter_query', [
+    '{Verdict}', '{Verdict} =', '{Verdict} is purple', '({Verdict} = x', '{Verdict} = x)', '{a} = 1 &&', '= 1',
+])
+def test_parse_filter_rejects(filter_query):
+    with pytest.raises(ValueError):
+        parse_filter(filter_query)
+
+
+@pytest.mark.parametrize('filter_query, expected', [
+    # Categorical columns
+    ('{Source Name} = Reuters', ['Vaccines contain microchips', 'Drinking bleach cures covid']),
+    ('{Verdict} = false', ['The moon landing was staged']),
+    ('{Verdict} i= false', ['Vaccines contain microchips', 'The moon landing was staged']),
+    ('{Verdict} icontains fire', ['Drinking bleach cures covid']),
+    ('{Source Name} is blank', ['Unknown claim']),
+    ('{Source Name} is str', [claim[0] for claim in CLAIMS[:4]]),
+    # Datetime column
+    ('{Review Publication Date} datestartswith 2020', ['The moon landing was staged', 'Drinking bleach cures covid']),
+    ('{Review Publication Date} >= 2021-01-01', ['Vaccines contain microchips', 'Minimum wage rose in 2022']),
+    ('{Review Publication Date} < "2020-06-01"', ['Drinking bleach cures covid']),
+    ('{Review Publication Date} is nil', ['Unknown claim']),
+    ('{Review Publication Date} is str', []),
+    # Tags column
+    ('{Tags} contains health', ['Vaccines contain microchips', 'Drinking bleach cures covid']),
+    ('{Tags} contains wages', []),
+    ('{Tags} icontains wages', ['Minimum wage rose in 2022']),
+    ('{Tags} = economy, Wages', ['Minimum wage rose in 2022']),
+    ('{Tags} is blank', ['Unknown claim']),
+    # Combinations
+    ('{Tags} contains health && {Verdict} != False', ['Drinking bleach cures covid']),
+    ('{Source Name} = AFP || {Verdict} = True', ['The moon landing was staged', 'Minimum wage rose in 2022']),
+    ('!{Tags} contains health and not {Source Name} is blank', ['The moon landing was staged',
+                                                                 'Minimum wage rose in 2022']),
+    ('({Source Name} = AFP || {Source Name} = Reuters) && {Review Publication Date} datestartswith 2020',
+     ['The moon landing was staged', 'Drinking bleach cures covid']),
+    # Numeric tests never match text or dates
+    ('{Claim} is num || {Review Publication Date} is even || {Claim} is prime', []),
+    # Columns the table does not show are ignored
+    ('{Nope} = 1 && {Source Name} = AFP', ['The moon landing was staged']),
+])
+def test_apply_filter(result, filter_query, expected):
+    assert claims(result, filter_query) == expected
+
+
+def test_table_page_filters_then_pages(result):
+    records, page_count = table_page(result, 0, 1, [{'column_id': 'Claim', 'direction': 'asc'}],
+                                     '{Source Name} = Reuters')
+    assert page_count == 2
+    assert [record['Claim'] for record in records] == ['Drinking bleach cures covid']
+    assert records[0]['Tags'] == 'health, covid'
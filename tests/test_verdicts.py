@@ -0,0 +1,127 @@
+"""Pin what every phrase of the synonym table normalizes to, next to what the old ``str.replace`` chain made of it."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from feat.legacy import legacy_normalize
+from feat.verdicts import VERDICT_SYNONYMS, default_normalizer, group_small_verdicts
+
+# (raw verdict, output of the old replacement chain, output of the normalizer)
+PINNED = [
+    # en
+    ('fake', 'false', 'false'),
+    ('incorrect', 'false', 'false'),
+    ('scam', 'false', 'false'),
+    ('pants on fire', 'false', 'false'),
+    ('four pinocchios', 'false', 'false'),
+    ('three pinocchios', 'mostly false', 'mostly false'),
+    ('false content/false', 'false content/false', 'false'),
+    ('false context/false', 'false context/false', 'false'),
+    ('misleading/partly false', 'mostly false', 'mostly false'),
+    ('mostly true', 'half true', 'half true'),
+    ('correct', 'true', 'true'),
+    ('correct attribution', 'true', 'true'),
+    # es
+    ('falso', 'false', 'false'),
+    ('falsa', 'false', 'false'),
+    ('falso!', 'false!', 'false'),
+    ('es falso', 'false', 'false'),
+    ('incorrecto', 'falseo', 'false'),
+    ('engañoso', 'mostly false', 'mostly false'),
+    ('verdadero', 'true', 'true'),
+    ('cierto', 'true', 'true'),
+    # pt
+    ('errado', 'false', 'false'),
+    ('enganoso', 'false', 'false'),
+    ('enganador', 'mostly false', 'mostly false'),
+    ('partialmente falso', 'partialmente false', 'mostly false'),
+    # fr
+    ('faux', 'false', 'false'),
+    ("c'est faux", 'false', 'false'),
+    ('trompeur', 'false', 'false'),
+    # it
+    ('notizia falsa', 'false', 'false'),
+    ('pinocchio andante', 'false', 'false'),
+    ("c'eri quasi", 'half true', 'half true'),
+    ('notizia vera', 'true', 'true'),
+    ('vera', 'true', 'true'),
+    ('vero', 'true', 'true'),
+    # de
+    ('falsch', 'falsech', 'false'),
+    # nl
+    ('misleidend', 'misleading', 'misleading'),
+    # ro
+    ('fals', 'false', 'false'),
+    # sv
+    ('falskt', 'false', 'false'),
+    # pl
+    ('fałsz', 'false', 'false'),
+    ('falsz', 'falsez', 'false'),
+    # fi
+    ('epätosi', 'false', 'false'),
+    # sr
+    ('delimično netačno', 'mostly false', 'mostly false'),
+    # tr
+    ('yanlış', 'false', 'false'),
+    ('çok yanlış', 'çok false', 'false'),
+    ('doğru', 'true', 'true'),
+    ('dogru', 'true', 'true'),
+    ('doğruluk payı vardır', 'trueluk payı vardır', 'half true'),
+    # ru
+    ('неверно', 'false', 'false'),
+    ('правильно', 'true', 'true'),
+    # uk
+    ('помилковий', 'false', 'false'),
+    ('вірно', 'true', 'true'),
+    # ar
+    ('مضلل', 'false', 'false'),
+    ('زائف', 'false', 'false'),
+    # fa
+    ('نادرست', 'false', 'false'),
+    # bn
+    ('মিথ্যা', 'false', 'false'),
+    ('অসত্য', 'false', 'false'),
+    # zh
+    ('錯誤', 'false', 'false'),
+    ('錯誤的', 'false的', 'false'),
+    ('部分錯誤', '部分false', 'false'),
+    ('正確的', 'true', 'true'),
+    # ja
+    ('錯誤な', 'falseな', 'false'),
+    ('正しい', 'true', 'true'),
+]
+
+
+def test_every_synonym_is_pinned():
+    phrases = {phrase for table in VERDICT_SYNONYMS.values() for phrase in table}
+    assert phrases == {raw for raw, _, _ in PINNED}
+
+
+@pytest.mark.parametrize('raw, old, new', PINNED)
+def test_phrase(raw, old, new):
+    assert legacy_normalize(pd.Series([raw]))[0] == old
+    assert default_normalizer.normalize_one(raw) == new
+    # Case and trailing dots are ignored, as before (except for letters like Turkish 'ı' that lower() cannot restore).
+    if raw.upper().lower() == raw:
+        assert default_normalizer.normalize_one(raw.upper() + '.') == new
+
+
+def test_normalize_series():
+    verdicts = pd.Series(['Falso.', None, 'Mostly True', 'falso', 'Not rated'], index=[5, 6, 7, 8, 9], name='Verdict')
+    normalized = default_normalizer.normalize(verdicts)
+    assert normalized.dtype == 'category'
+    assert normalized.index.tolist() == [5, 6, 7, 8, 9]
+    assert normalized.name == 'Verdict'
+    assert normalized.astype(object).where(normalized.notna(), None).tolist() == [
+        'false', None, 'half true', 'false', 'not rated']
+
+
+@pytest.mark.parametrize('verdicts', [
+    pd.Series([None, np.nan], name='Verdict'),
+    pd.Series([], dtype=object, name='Verdict'),
+])
+def test_normalize_without_verdicts(verdicts):
+    normalized = default_normalizer.normalize(verdicts)
+    assert len(normalized) == len(verdicts)
+    assert normalized.isna().all()
+    assert group_small_verdicts(normalized).isna().all()